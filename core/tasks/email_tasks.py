@@ -9,6 +9,13 @@ from utils.logger import setup_logger
 
 logger = setup_logger("email_tasks")
 
+# Task loops run on uvloop like the web server, where it is installed (not on Windows)
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
 
 @shared_task(name='otom.tasks.email.process_consultation')
 def process_email_consultation(session_id: str, email_data: Dict[str, Any]) -> Dict:
@@ -20,7 +27,7 @@ def process_email_consultation(session_id: str, email_data: Dict[str, Any]) -> D
         from core.consultant.otom_brain import OtomConsultant
 
         # Create async event loop for task
-        loop = asyncio.new_event_loop()
+        loop = _new_event_loop()
         asyncio.set_event_loop(loop)
 
         # Initialize consultant and email handler
@@ -50,7 +57,7 @@ def generate_email_report(session_id: str, report_type: str) -> str:
     try:
         from core.deliverables.report_generator import ReportGenerator
 
-        loop = asyncio.new_event_loop()
+        loop = _new_event_loop()
         asyncio.set_event_loop(loop)
 
         generator = ReportGenerator()
@@ -78,7 +85,7 @@ def process_pending_emails():
     try:
         from integrations.supabase_mcp import SupabaseMCP
 
-        loop = asyncio.new_event_loop()
+        loop = _new_event_loop()
         asyncio.set_event_loop(loop)
 
         mcp = SupabaseMCP()
@@ -118,7 +125,7 @@ def send_followup_email(session_id: str, followup_type: str) -> bool:
         from interfaces.email.email_handler import EmailInterface
         from core.consultant.otom_brain import OtomConsultant
 
-        loop = asyncio.new_event_loop()
+        loop = _new_event_loop()
         asyncio.set_event_loop(loop)
 
         consultant = OtomConsultant()
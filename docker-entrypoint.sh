@@ -5,4 +5,4 @@ set -e
 PORT=${PORT:-8000}
 
 echo "Starting Otom on port $PORT..."
-exec uvicorn main:app --host 0.0.0.0 --port $PORT
+exec uvicorn main:app --host 0.0.0.0 --port $PORT --loop uvloop --http httptools
@@ -6,7 +6,7 @@ module.exports = {
     {
       name: 'otom-backend',
       script: 'uvicorn',
-      args: 'main:app --host 0.0.0.0 --port 8000',
+      args: 'main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools',
       interpreter: 'python3',
       cwd: '/Users/sukinyang/Downloads/otom-main',
       env: {
@@ -7,16 +7,43 @@ Free tier: 500MB database, 1GB file storage, 2GB bandwidth
 import os
 import json
 import asyncio
+import inspect
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import uuid
 
-from supabase import create_client, Client
+import httpx
+from supabase import create_client, Client, ClientOptions
 
 from utils.logger import setup_logger
 
 logger = setup_logger("supabase")
 
+# Maximum rows sent to PostgREST in a single insert
+MAX_BATCH = 100
+
+# Keep-alive pool shared by every PostgREST request from one client.
+# Idle connections are recycled after 60s - Supabase's edge closes them soon after.
+POOL_LIMITS = httpx.Limits(max_connections=15, max_keepalive_connections=10, keepalive_expiry=60)
+
+
+# supabase-py only accepts a caller-supplied httpx client in newer releases
+_HAS_HTTPX_CLIENT_OPTION = "httpx_client" in inspect.signature(ClientOptions).parameters
+
+
+def _create_pooled_client(url: str, key: str) -> Client:
+    """Create a Supabase client whose HTTP calls reuse one connection pool"""
+    if not _HAS_HTTPX_CLIENT_OPTION:
+        logger.warning("Installed supabase-py has no httpx_client option - using its default HTTP pool")
+        return create_client(url, key)
+
+    http_client = httpx.Client(limits=POOL_LIMITS, timeout=httpx.Timeout(30.0, connect=5.0))
+    try:
+        return create_client(url, key, options=ClientOptions(httpx_client=http_client))
+    except Exception:
+        http_client.close()
+        raise
+
 
 class SupabaseBackend:
     """
@@ -30,6 +57,9 @@ class SupabaseBackend:
         self.supabase_key = os.getenv("SUPABASE_KEY") or os.getenv("SUPABASE_ANON_KEY")
         self.service_key = os.getenv("SUPABASE_SERVICE_KEY")
 
+        # Strong references to fire-and-forget tasks so they aren't collected mid-flight
+        self._background_tasks: set = set()
+
         if not self.supabase_url or not self.supabase_key:
             logger.warning("Supabase credentials not configured - running in memory-only mode")
             self.client = None
@@ -37,7 +67,7 @@ class SupabaseBackend:
 
         # Initialize Supabase client
         try:
-            self.client: Client = create_client(self.supabase_url, self.supabase_key)
+            self.client: Client = _create_pooled_client(self.supabase_url, self.supabase_key)
             logger.info("Supabase client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Supabase client: {e}")
@@ -48,13 +78,30 @@ class SupabaseBackend:
         self.service_client: Client = None
         if self.service_key:
             try:
-                self.service_client = create_client(self.supabase_url, self.service_key)
+                self.service_client = _create_pooled_client(self.supabase_url, self.service_key)
             except Exception as e:
                 logger.error(f"Failed to initialize Supabase service client: {e}")
 
         self.storage_bucket = os.getenv("SUPABASE_STORAGE_BUCKET", "otom-files")
         logger.info("Supabase backend initialized")
 
+    def run_in_background(self, coro) -> asyncio.Task:
+        """Schedule a write without awaiting it; failures are logged"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        """Drop the strong reference and surface any error"""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background database task failed: {task.exception()}")
+
+    def insert_background(self, table: str, rows: Any) -> asyncio.Task:
+        """Fire-and-forget insert, for logging off the response path"""
+        return self.run_in_background(self.insert(table, rows))
+
     def _check_client(self) -> bool:
         """Check if Supabase client is available"""
         if not self.client:
@@ -62,6 +109,88 @@ class SupabaseBackend:
             return False
         return True
 
+    # ===========================================
+    # GENERIC TABLE HELPERS
+    # ===========================================
+
+    async def insert(self, table: str, rows: Any) -> List[Dict]:
+        """Insert one row or a list of rows, in chunks of MAX_BATCH"""
+        if not self._check_client():
+            return []
+
+        if isinstance(rows, dict):
+            rows = [rows]
+        if not rows:
+            return []
+
+        inserted = []
+        for i in range(0, len(rows), MAX_BATCH):
+            chunk = rows[i:i + MAX_BATCH]
+            try:
+                response = await asyncio.to_thread(
+                    lambda: self.client.table(table).insert(chunk).execute()
+                )
+                inserted.extend(response.data or [])
+            except Exception as e:
+                # One bad row fails the whole statement - retry row by row so the rest land
+                logger.warning(f"Batch insert into {table} failed, retrying per row: {str(e)}")
+                for row in chunk:
+                    try:
+                        response = await asyncio.to_thread(
+                            lambda: self.client.table(table).insert(row).execute()
+                        )
+                        inserted.extend(response.data or [])
+                    except Exception as e:
+                        logger.error(f"Failed to insert into {table}: {str(e)}")
+
+        return inserted
+
+    async def query(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: str = "*",
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Select rows matching equality filters"""
+        if not self._check_client():
+            return []
+
+        def _run():
+            q = self.client.table(table).select(columns)
+            for column, value in (filters or {}).items():
+                q = q.eq(column, value)
+            if limit:
+                q = q.limit(limit)
+            return q.execute()
+
+        try:
+            response = await asyncio.to_thread(_run)
+            return response.data or []
+
+        except Exception as e:
+            logger.error(f"Failed to query {table}: {str(e)}")
+            return []
+
+    async def update(self, table: str, values: Dict[str, Any], filters: Dict[str, Any]) -> List[Dict]:
+        """Update rows matching equality filters (a list value matches any of its items)"""
+        if not self._check_client():
+            return []
+
+        def _run():
+            q = self.client.table(table).update(values)
+            for column, value in filters.items():
+                q = q.in_(column, value) if isinstance(value, (list, tuple)) else q.eq(column, value)
+            return q.execute()
+
+        try:
+            response = await asyncio.to_thread(_run)
+            return response.data or []
+
+        except Exception as e:
+            logger.error(f"Failed to update {table}: {str(e)}")
+            return []
+
     # ===========================================
     # VOICE CALL SESSIONS (Vapi Integration)
     # ===========================================
@@ -91,7 +220,9 @@ class SupabaseBackend:
             # Remove None values
             data = {k: v for k, v in data.items() if v is not None}
 
-            response = self.client.table("call_sessions").insert(data).execute()
+            response = await asyncio.to_thread(
+                lambda: self.client.table("call_sessions").insert(data).execute()
+            )
             logger.info(f"Created call session: {data['id']}")
             return response.data[0] if response.data else data
 
@@ -111,9 +242,9 @@ class SupabaseBackend:
             if "metadata" in updates and isinstance(updates["metadata"], dict):
                 updates["metadata"] = json.dumps(updates["metadata"])
 
-            response = self.client.table("call_sessions").update(updates).eq(
-                "id", session_id
-            ).execute()
+            response = await asyncio.to_thread(
+                lambda: self.client.table("call_sessions").update(updates).eq("id", session_id).execute()
+            )
 
             return response.data[0] if response.data else updates
 
@@ -148,6 +279,42 @@ class SupabaseBackend:
             logger.error(f"Failed to complete call session: {str(e)}")
             return call_data
 
+    async def complete_call(
+        self,
+        session_id: str,
+        duration: int,
+        transcript: str,
+        summary: str
+    ) -> None:
+        """Complete a call session and track call_completed in one transaction"""
+        if not self._check_client():
+            return
+
+        try:
+            await asyncio.to_thread(
+                lambda: self.client.rpc("complete_call", {
+                    "p_session_id": session_id,
+                    "p_duration": int(duration or 0),
+                    "p_transcript": transcript,
+                    "p_summary": summary
+                }).execute()
+            )
+            logger.info(f"Completed call session: {session_id}")
+
+        except Exception as e:
+            # Fall back to separate writes, e.g. if migration 007 isn't applied yet
+            logger.error(f"complete_call RPC failed, writing separately: {str(e)}")
+            await self.complete_call_session(session_id, {
+                "duration_seconds": duration,
+                "transcript": transcript,
+                "summary": summary
+            })
+            await self.track_event("call_completed", {
+                "session_id": session_id,
+                "platform": "vapi",
+                "duration_seconds": duration
+            })
+
     async def get_call_session(self, session_id: str) -> Optional[Dict]:
         """Get call session by ID"""
         if not self._check_client():
@@ -196,6 +363,62 @@ class SupabaseBackend:
             logger.error(f"Failed to list call sessions: {str(e)}")
             return []
 
+    async def call_stats(self, days: int = 30) -> Dict:
+        """Aggregate call counts and average duration over the last `days` days"""
+        if not self._check_client():
+            return {}
+
+        try:
+            response = await asyncio.to_thread(
+                lambda: self.client.rpc("call_stats", {"p_days": days}).execute()
+            )
+            return response.data[0] if response.data else {}
+
+        except Exception as e:
+            # e.g. migration 006 not applied yet - aggregate client-side instead
+            logger.error(f"call_stats RPC failed, aggregating in Python: {str(e)}")
+
+        try:
+            start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
+            response = await asyncio.to_thread(
+                lambda: self.client.table("call_sessions").select(
+                    "status, duration_seconds, direction"
+                ).gte("created_at", start_date).execute()
+            )
+
+            # Single pass over the rows, no intermediate lists
+            total = completed = active = inbound = outbound = 0
+            dur_sum = dur_n = 0
+            for c in response.data or []:
+                total += 1
+                status = c.get("status")
+                if status == "completed":
+                    completed += 1
+                    duration = c.get("duration_seconds") or 0
+                    if duration > 0:
+                        dur_sum += duration
+                        dur_n += 1
+                elif status in ("connecting", "in-progress", "initiated"):
+                    active += 1
+                direction = c.get("direction")
+                if direction == "inbound":
+                    inbound += 1
+                elif direction == "outbound":
+                    outbound += 1
+
+            return {
+                "total": total,
+                "completed": completed,
+                "active": active,
+                "avg_duration": dur_sum / dur_n if dur_n else 0,
+                "inbound": inbound,
+                "outbound": outbound
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get call stats: {str(e)}")
+            return {}
+
     # ===========================================
     # CHAT SESSIONS (Multi-platform)
     # ===========================================
@@ -527,7 +750,9 @@ class SupabaseBackend:
                 "timestamp": datetime.utcnow().isoformat()
             }
 
-            self.client.table("analytics").insert(data).execute()
+            await asyncio.to_thread(
+                lambda: self.client.table("analytics").insert(data).execute()
+            )
 
         except Exception as e:
             logger.error(f"Failed to track event: {str(e)}")
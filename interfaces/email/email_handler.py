@@ -258,20 +258,15 @@ class EmailInterface:
             success = await self.send_email(to_email, subject, content)
 
             # Log to Supabase
-            if supabase.client:
-                email_record = {
-                    "id": str(uuid.uuid4()),
-                    "employee_id": employee_id,
-                    "to_email": to_email,
-                    "subject": subject,
-                    "template": "initial_outreach",
-                    "status": "sent" if success else "failed",
-                    "created_at": datetime.utcnow().isoformat()
-                }
-                try:
-                    supabase.client.table("email_outreach").insert(email_record).execute()
-                except Exception as e:
-                    logger.warning(f"Failed to log email to database: {e}")
+            await supabase.insert("email_outreach", {
+                "id": str(uuid.uuid4()),
+                "employee_id": employee_id,
+                "to_email": to_email,
+                "subject": subject,
+                "template": "initial_outreach",
+                "status": "sent" if success else "failed",
+                "created_at": datetime.utcnow().isoformat()
+            })
 
             if success:
                 logger.info(f"Outreach email sent to {to_email}")
@@ -0,0 +1,89 @@
+"""
+Shared HTTP client for Otom
+Provides one pooled aiohttp session reused by all outbound integrations
+"""
+
+import asyncio
+import random
+from typing import Optional
+
+import aiohttp
+
+from utils.logger import setup_logger
+
+logger = setup_logger("http_client")
+
+# Retries for rate-limited (429) and, where safe, failed (5xx) upstream requests
+RETRY_ATTEMPTS = 5
+RETRY_MAX_DELAY = 30.0
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use"""
+    global _session
+
+    if _session is not None and not _session.closed:
+        return _session
+
+    async with _session_lock:
+        if _session is None or _session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                keepalive_timeout=75,
+                ttl_dns_cache=300
+            )
+            _session = aiohttp.ClientSession(connector=connector)
+            logger.info("Shared HTTP session created")
+
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared aiohttp session"""
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("Shared HTTP session closed")
+    _session = None
+
+
+def _retry_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+    """Seconds to wait before the next attempt, honoring Retry-After when given"""
+    retry_after = response.headers.get("Retry-After")
+    if response.status == 429 and retry_after:
+        try:
+            return min(float(retry_after), RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form - fall back to exponential backoff
+    return min(2 ** attempt + random.random(), RETRY_MAX_DELAY)
+
+
+async def request_with_retry(
+    method: str,
+    url: str,
+    retry_5xx: bool = False,
+    attempts: int = RETRY_ATTEMPTS,
+    **kwargs
+) -> aiohttp.ClientResponse:
+    """
+    Send a request on the shared session, retrying 429s with backoff.
+    Only pass retry_5xx=True for idempotent requests - a 5xx may mean the write landed.
+    Use the result as `async with await request_with_retry(...) as response:`.
+    """
+    session = await get_session()
+
+    for attempt in range(attempts):
+        response = await session.request(method, url, **kwargs)
+        retryable = response.status == 429 or (retry_5xx and response.status >= 500)
+        if not retryable or attempt == attempts - 1:
+            return response
+
+        delay = _retry_delay(response, attempt)
+        response.release()
+        logger.warning(f"{method} {url} returned {response.status}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
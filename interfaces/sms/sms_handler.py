@@ -4,36 +4,134 @@ Handles Twilio SMS for initial outreach before phone calls
 """
 
 import os
+import re
+from xml.sax.saxutils import escape
 import json
-from typing import Dict, List, Any, Optional
-from datetime import datetime
-import uuid
+import asyncio
+from string import Template
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+import orjson
+import httpx
+from cachetools import TTLCache
 
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict
 
 # Handle Twilio import gracefully
 try:
-    from twilio.rest import Client
-    from twilio.twiml.messaging_response import MessagingResponse
     from twilio.request_validator import RequestValidator
     TWILIO_AVAILABLE = True
 except ImportError:
-    Client = None
-    MessagingResponse = None
     RequestValidator = None
     TWILIO_AVAILABLE = False
 
 from utils.logger import setup_logger
+from utils.time_utils import utcnow_iso
+from interfaces.http_client import get_session
 from integrations.supabase_mcp import supabase
 
 logger = setup_logger("sms_handler")
 
 if not TWILIO_AVAILABLE:
-    logger.warning("Twilio package not installed - SMS features unavailable")
+    logger.warning("Twilio package not installed - SMS webhook signature validation unavailable")
 
 router = APIRouter(prefix="/sms", tags=["SMS"])
 
+# /sms/messages projection and page size cap
+_MESSAGE_KEYS = ("id", "employee_id", "phone_number", "direction", "message", "status", "created_at")
+_MESSAGE_SELECT = ",".join(_MESSAGE_KEYS) + ",employees(name)"
+MAX_MESSAGES_PAGE = 500
+
+# TwiML replies always have the same shape - splice the escaped text in
+_TWIML_PREFIX = b'<?xml version="1.0" encoding="UTF-8"?><Response><Message>'
+_TWIML_SUFFIX = b'</Message></Response>'
+
+
+def _twiml(text: str) -> bytes:
+    """Build a single-message TwiML reply"""
+    return _TWIML_PREFIX + escape(text).encode() + _TWIML_SUFFIX
+
+
+_TWIML_ERROR = _twiml("Sorry, there was an error processing your message.")
+
+# Vapi calls queued within this window (seconds) are placed together
+VAPI_BATCH_WINDOW = 0.2
+VAPI_BATCH_MAX = 50
+
+# Free-text schedule requests like "tue 2pm", "thurs at 3" or "Thursday at 10:30 am".
+# A bare number needs "at" or am/pm, and the day must be a whole day name or abbreviation;
+# none of these match: "month 2", "satisfied 10 out of 10", "my friend 3", "mon 3"
+_TIME_RE = re.compile(
+    r"\b(?P<day>mon(?:day)?|tues?(?:day)?|wed(?:nesday)?|thu(?:rs?(?:day)?)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)\b\s*"
+    r"(?:at\s*|(?=\d{1,2}(?::\d{2})?\s*(?:am|pm)\b))"
+    r"(?P<h>\d{1,2})(?::(?P<m>\d{2}))?\s*(?P<ap>am|pm)?\b",
+    re.I
+)
+_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+# Employee profile fields keyed by phone number, so repeat correspondents skip the lookup.
+# Status is left out on purpose: other writers (dashboard, WhatsApp, voice) don't evict this
+# cache, so the consent branch reads it fresh
+_EMPLOYEE_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_EMPLOYEE_CACHE_COLUMNS = "id, name, email, phone_number, company, department, role, notes"
+
+# Inbound keyword intents (matched against the stripped, lowercased body)
+INTENT_STOP = frozenset({"stop", "unsubscribe", "cancel", "end", "quit"})
+INTENT_HELP = frozenset({"help", "info"})
+INTENT_START = frozenset({"start", "subscribe", "unstop"})
+INTENT_CONSENT = frozenset({"yes", "y", "yeah", "yep", "ok", "okay"})
+INTENT_CALL = frozenset({"1", "call", "call me", "yes call me"})
+INTENT_SCHEDULE = frozenset({"2", "schedule", "later", "schedule later"})
+INTENT_DECLINE = frozenset({"3", "no", "not interested", "no thanks"})
+
+KEYWORD_TO_INTENT = {
+    kw: intent
+    for intent, kws in (
+        ("stop", INTENT_STOP),
+        ("help", INTENT_HELP),
+        ("start", INTENT_START),
+        ("consent", INTENT_CONSENT),
+        ("call", INTENT_CALL),
+        ("schedule", INTENT_SCHEDULE),
+        ("decline", INTENT_DECLINE),
+    )
+    for kw in kws
+}
+
+
+# Request bodies
+class SendSMSBody(BaseModel):
+    """Body for /sms/send"""
+    to: str
+    message: str
+    employee_id: Optional[str] = None
+
+
+class OutreachBody(BaseModel):
+    """Body for /sms/consent-request and /sms/outreach"""
+    phone_number: str
+    name: str = "there"
+    company: str = "our team"
+    employee_id: Optional[str] = None
+
+
+class EmployeeIn(BaseModel):
+    """Employee entry in a bulk send request"""
+    model_config = ConfigDict(extra="allow")
+
+    id: Optional[str] = None
+    name: str = "there"
+    phone_number: Optional[str] = None
+
+
+class BulkBody(BaseModel):
+    """Body for /sms/bulk-consent-request and /sms/bulk-outreach"""
+    employees: List[EmployeeIn] = []
+    company: str = "our team"
+
 
 class SMSInterface:
     """Handles SMS-based interactions with Otom via Twilio"""
@@ -44,10 +142,18 @@ class SMSInterface:
         self.auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         self.phone_number = os.getenv("TWILIO_PHONE_NUMBER")
 
-        # Initialize Twilio client if credentials are available
+        # Initialize Twilio REST client if credentials are available.
+        # Messages are sent over one pooled HTTP/2 connection instead of the
+        # blocking SDK, so concurrent sends multiplex on a single TLS session.
         if self.account_sid and self.auth_token:
-            self.client = Client(self.account_sid, self.auth_token)
-            self.validator = RequestValidator(self.auth_token)
+            self.client = httpx.AsyncClient(
+                http2=True,
+                auth=(self.account_sid, self.auth_token),
+                base_url=f"https://api.twilio.com/2010-04-01/Accounts/{self.account_sid}/",
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=50)
+            )
+            self.validator = RequestValidator(self.auth_token) if RequestValidator else None
             logger.info("Twilio SMS interface initialized")
         else:
             self.client = None
@@ -61,19 +167,19 @@ class SMSInterface:
         self.privacy_url = os.getenv("PRIVACY_URL", "https://otom.ai/privacy")
         self.terms_url = os.getenv("TERMS_URL", "https://otom.ai/terms")
 
-        # SMS templates - TFV Compliant
+        # SMS templates - TFV Compliant ($-placeholders, compiled once)
         self.templates = {
             # Double opt-in: First message asks for consent
-            "consent_request": """Hi {name}! This is Otom on behalf of {company}.
+            "consent_request": Template("""Hi $name! This is Otom on behalf of $company.
 
 We'd like to send you occasional texts for feedback & interview scheduling.
 
 Reply YES to opt in. Reply STOP to opt out anytime.
 
-Msg & data rates may apply. Privacy: {privacy_url}""",
+Msg & data rates may apply. Privacy: $privacy_url"""),
 
             # After consent received, send the actual outreach
-            "initial_outreach": """Hi {name}! This is Otom from {company}.
+            "initial_outreach": Template("""Hi $name! This is Otom from $company.
 
 We're reaching out to learn about your experience and gather feedback.
 
@@ -84,35 +190,35 @@ Reply:
 2 - Schedule for later
 3 - Not interested
 
-Reply STOP to opt out. HELP for help.""",
+Reply STOP to opt out. HELP for help."""),
 
-            "schedule_followup": """Great! Pick a time that works for you:
+            "schedule_followup": Template("""Great! Pick a time that works for you:
 
-{cal_link}
+$cal_link
 
 Just click the link and choose a slot. We'll call you at the scheduled time!
 
-Reply STOP to opt out.""",
+Reply STOP to opt out."""),
 
-            "call_confirmation": """Perfect! You'll receive a call from Otom shortly.
+            "call_confirmation": Template("""Perfect! You'll receive a call from Otom shortly.
 
 The call will take about 15 minutes. We appreciate your time!
 
-Reply STOP to opt out.""",
+Reply STOP to opt out."""),
 
-            "thank_you": """Thank you for your response. We appreciate your time!
+            "thank_you": Template("""Thank you for your response. We appreciate your time!
 
 If you change your mind, just reply "CALL" and we'll reach out.
 
-Reply STOP to opt out.""",
+Reply STOP to opt out."""),
 
             # STOP keyword response (required for TCPA)
-            "stop_confirmation": """You have been unsubscribed from Otom messages. You will not receive any more texts from us.
+            "stop_confirmation": Template("""You have been unsubscribed from Otom messages. You will not receive any more texts from us.
 
-Reply START to re-subscribe.""",
+Reply START to re-subscribe."""),
 
             # HELP keyword response (required for TCPA)
-            "help_response": """Otom SMS Help:
+            "help_response": Template("""Otom SMS Help:
 
 Reply 1 to request a call now
 Reply 2 to schedule a call
@@ -120,60 +226,210 @@ Reply 3 or STOP to opt out
 Reply CALL to request a callback
 
 Support: support@otom.ai
-Privacy: {privacy_url}""",
+Privacy: $privacy_url"""),
 
             # START keyword response (re-subscribe)
-            "start_confirmation": """Welcome back! You have been re-subscribed to Otom messages.
+            "start_confirmation": Template("""Welcome back! You have been re-subscribed to Otom messages.
 
-Reply STOP to opt out anytime. Msg & data rates may apply.""",
+Reply STOP to opt out anytime. Msg & data rates may apply."""),
 
             # Consent confirmed response
-            "consent_confirmed": """Thanks for opting in to Otom messages!
+            "consent_confirmed": Template("""Thanks for opting in to Otom messages!
 
 We'll reach out shortly with feedback opportunities.
 
-Reply STOP to opt out anytime. Msg & data rates may apply."""
+Reply STOP to opt out anytime. Msg & data rates may apply."""),
+
+            # Free-text time parsed into a booking
+            "schedule_confirmed": Template("""You're booked! Otom will call you $when.
+
+Reply STOP to opt out.""")
+        }
+
+        # Outbound Vapi calls are handed to a background worker so the
+        # Twilio webhook can reply immediately
+        self._vapi_q: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._vapi_worker_task: Optional[asyncio.Task] = None
+
+        # Timezone assumed for times typed into SMS replies
+        self.timezone = os.getenv("DEFAULT_TIMEZONE", "America/New_York")
+
+        # Set by the app at startup to queue the call for a booking made over SMS
+        self.on_booking: Optional[Callable[[str, datetime, str, str], None]] = None
+
+        # Keyword replies don't vary per recipient - render them once
+        self.replies = {
+            key: self.templates[key].substitute(cal_link=self.cal_link, privacy_url=self.privacy_url)
+            for key in (
+                "schedule_followup",
+                "call_confirmation",
+                "thank_you",
+                "stop_confirmation",
+                "help_response",
+                "start_confirmation",
+                "consent_confirmed"
+            )
         }
 
+    async def _set_employee_status(
+        self,
+        emp_id: str,
+        status: str,
+        extra: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Update an employee's status (plus any extra columns) off the event loop"""
+        if not supabase.client or not emp_id:
+            return
+
+        payload = {"status": status, "updated_at": utcnow_iso()}
+        if extra:
+            payload.update(extra)
+
+        try:
+            await asyncio.to_thread(
+                lambda: supabase.client.table("employees").update(payload).eq("id", emp_id).execute()
+            )
+        except Exception as e:
+            logger.error(f"Failed to set employee {emp_id} status to {status}: {str(e)}")
+
+    async def _lookup_employee(self, phone: str) -> Optional[Dict]:
+        """Find an employee's profile by phone number, served from a short-lived cache"""
+        employee = _EMPLOYEE_CACHE.get(phone)
+        if employee is not None:
+            return employee
+
+        matches = await supabase.query(
+            "employees", filters={"phone_number": phone}, columns=_EMPLOYEE_CACHE_COLUMNS, limit=1
+        )
+        employee = matches[0] if matches else None
+        if employee is not None:
+            _EMPLOYEE_CACHE[phone] = employee
+        return employee
+
+    async def _employee_status(self, emp_id: str) -> str:
+        """Read an employee's current status, bypassing the profile cache"""
+        matches = await supabase.query("employees", filters={"id": emp_id}, columns="status", limit=1)
+        return (matches[0].get("status") or "") if matches else ""
+
+    def start_vapi_worker(self) -> None:
+        """Start the background Vapi call worker (called from app startup)"""
+        if self._vapi_worker_task is None or self._vapi_worker_task.done():
+            self._vapi_worker_task = asyncio.create_task(self._vapi_worker())
+            logger.info("SMS Vapi call worker started")
+
+    async def _vapi_worker(self) -> None:
+        """Drain queued call requests, placing each burst concurrently"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._vapi_q.get()]
+
+            # Coalesce anything else that arrives within the batch window
+            deadline = loop.time() + VAPI_BATCH_WINDOW
+            while len(batch) < VAPI_BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._vapi_q.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await asyncio.gather(
+                    *[self._trigger_vapi_call(phone, employee) for phone, employee in batch],
+                    return_exceptions=True
+                )
+            finally:
+                for _ in batch:
+                    self._vapi_q.task_done()
+
+    async def _enqueue_vapi_call(self, phone_number: str, employee: Dict) -> None:
+        """Queue a Vapi call, or place it inline if the worker can't take it"""
+        if self._vapi_worker_task is not None and not self._vapi_worker_task.done():
+            try:
+                self._vapi_q.put_nowait((phone_number, employee))
+                return
+            except asyncio.QueueFull:
+                logger.warning("Vapi call queue full - triggering call inline")
+
+        await self._trigger_vapi_call(phone_number, employee)
+
+    async def aclose(self) -> None:
+        """Stop the Vapi worker and close the pooled Twilio HTTP client"""
+        if self._vapi_worker_task is not None:
+            self._vapi_worker_task.cancel()
+            try:
+                await self._vapi_worker_task
+            except asyncio.CancelledError:
+                pass
+            self._vapi_worker_task = None
+
+        if self.client:
+            await self.client.aclose()
+
+    def is_valid_twilio_request(self, request: Request, params: Dict[str, Any]) -> bool:
+        """Check the X-Twilio-Signature header (skipped when Twilio is not configured)"""
+        if not self.validator:
+            return True
+
+        signature = request.headers.get("X-Twilio-Signature", "")
+        if not signature:
+            return False
+
+        # Behind a TLS-terminating proxy the app sees http://, but Twilio signs the public URL
+        url = request.url
+        forwarded_proto = request.headers.get("X-Forwarded-Proto")
+        if forwarded_proto:
+            url = url.replace(scheme=forwarded_proto)
+
+        return self.validator.validate(str(url), params, signature)
+
     async def send_sms(
         self,
         to_number: str,
         message: str,
-        employee_id: Optional[str] = None
+        employee_id: Optional[str] = None,
+        defer: Optional[List[Dict]] = None
     ) -> Dict[str, Any]:
-        """Send an SMS message"""
+        """Send an SMS message (append the log record to `defer` to batch-insert it later)"""
         if not self.client:
             logger.error("Twilio client not initialized")
             return {"success": False, "error": "SMS not configured"}
 
         try:
             # Send the message
-            twilio_message = self.client.messages.create(
-                body=message,
-                from_=self.phone_number,
-                to=to_number
+            response = await self.client.post(
+                "Messages.json",
+                data={"To": to_number, "From": self.phone_number, "Body": message}
             )
+            result = orjson.loads(response.content)
+
+            if response.status_code >= 400:
+                error = result.get("message", response.text)
+                logger.error(f"Twilio API error: {error}")
+                return {"success": False, "error": error}
 
             # Log to Supabase
             sms_record = {
-                "id": str(uuid.uuid4()),
                 "employee_id": employee_id,
                 "phone_number": to_number,
                 "direction": "outbound",
                 "message": message,
-                "twilio_sid": twilio_message.sid,
-                "status": twilio_message.status,
-                "created_at": datetime.utcnow().isoformat()
+                "twilio_sid": result["sid"],
+                "status": result["status"],
+                "created_at": utcnow_iso()
             }
 
-            if supabase.client:
-                supabase.client.table("sms_messages").insert(sms_record).execute()
+            if defer is not None:
+                defer.append(sms_record)
+            else:
+                supabase.insert_background("sms_messages", sms_record)
 
-            logger.info(f"SMS sent to {to_number}: {twilio_message.sid}")
+            logger.info(f"SMS sent to {to_number}: {result['sid']}")
             return {
                 "success": True,
-                "message_sid": twilio_message.sid,
-                "status": twilio_message.status
+                "message_sid": result["sid"],
+                "status": result["status"]
             }
 
         except Exception as e:
@@ -185,36 +441,35 @@ Reply STOP to opt out anytime. Msg & data rates may apply."""
         to_number: str,
         employee_name: str,
         company_name: str,
-        employee_id: str
+        employee_id: str,
+        defer: Optional[List[Dict]] = None
     ) -> Dict[str, Any]:
         """Send double opt-in consent request SMS (Step 1 of TFV compliant flow)"""
-        message = self.templates["consent_request"].format(
+        message = self.templates["consent_request"].substitute(
             name=employee_name,
             company=company_name,
             privacy_url=self.privacy_url
         )
 
         # Update employee status to awaiting_consent
-        if supabase.client and employee_id:
-            supabase.client.table("employees").update(
-                {"status": "awaiting_consent", "updated_at": datetime.utcnow().isoformat()}
-            ).eq("id", employee_id).execute()
+        await self._set_employee_status(employee_id, "awaiting_consent")
 
-        return await self.send_sms(to_number, message, employee_id)
+        return await self.send_sms(to_number, message, employee_id, defer)
 
     async def send_initial_outreach(
         self,
         to_number: str,
         employee_name: str,
         company_name: str,
-        employee_id: str
+        employee_id: str,
+        defer: Optional[List[Dict]] = None
     ) -> Dict[str, Any]:
         """Send initial outreach SMS to an employee (after consent received)"""
-        message = self.templates["initial_outreach"].format(
+        message = self.templates["initial_outreach"].substitute(
             name=employee_name,
             company=company_name
         )
-        return await self.send_sms(to_number, message, employee_id)
+        return await self.send_sms(to_number, message, employee_id, defer)
 
     async def handle_incoming_sms(
         self,
@@ -223,75 +478,62 @@ Reply STOP to opt out anytime. Msg & data rates may apply."""
         twilio_sid: str
     ) -> str:
         """Handle incoming SMS and return response - TFV Compliant"""
-        body_lower = body.strip().lower()
+        intent = KEYWORD_TO_INTENT.get(body.strip().lower())
 
         # Log incoming message
         sms_record = {
-            "id": str(uuid.uuid4()),
             "phone_number": from_number,
             "direction": "inbound",
             "message": body,
             "twilio_sid": twilio_sid,
             "status": "received",
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": utcnow_iso()
         }
 
+        # Log the message in the background - the TwiML reply doesn't depend on it
+        supabase.insert_background("sms_messages", sms_record)
+
         # Find employee by phone number
-        employee = None
-        if supabase.client:
-            supabase.client.table("sms_messages").insert(sms_record).execute()
-            # Try to find the employee
-            result = supabase.client.table("employees").select("*").eq("phone_number", from_number).execute()
-            if result.data:
-                employee = result.data[0]
-                sms_record["employee_id"] = employee.get("id")
+        employee = await self._lookup_employee(from_number)
 
         # ============================================
         # TCPA REQUIRED: Handle STOP keyword first (highest priority)
         # ============================================
-        if body_lower in ["stop", "unsubscribe", "cancel", "end", "quit"]:
-            if employee and supabase.client:
-                supabase.client.table("employees").update(
-                    {"status": "opted_out", "sms_consent": False, "updated_at": datetime.utcnow().isoformat()}
-                ).eq("id", employee["id"]).execute()
+        if intent == "stop":
+            if employee:
+                await self._set_employee_status(employee["id"], "opted_out", {"sms_consent": False})
             logger.info(f"User {from_number} opted out via STOP")
-            return self.templates["stop_confirmation"]
+            return self.replies["stop_confirmation"]
 
         # ============================================
         # TCPA REQUIRED: Handle HELP keyword
         # ============================================
-        if body_lower in ["help", "info"]:
-            return self.templates["help_response"].format(privacy_url=self.privacy_url)
+        if intent == "help":
+            return self.replies["help_response"]
 
         # ============================================
         # Handle START keyword (re-subscribe)
         # ============================================
-        if body_lower in ["start", "subscribe", "unstop"]:
-            if employee and supabase.client:
-                supabase.client.table("employees").update(
-                    {"status": "consented", "sms_consent": True, "updated_at": datetime.utcnow().isoformat()}
-                ).eq("id", employee["id"]).execute()
+        if intent == "start":
+            if employee:
+                await self._set_employee_status(employee["id"], "consented", {"sms_consent": True})
             logger.info(f"User {from_number} re-subscribed via START")
-            return self.templates["start_confirmation"]
+            return self.replies["start_confirmation"]
 
         # ============================================
         # Handle YES - Double opt-in consent confirmation
         # ============================================
-        if body_lower in ["yes", "y", "yeah", "yep", "ok", "okay"]:
+        if intent == "consent":
             # Check if user is in awaiting_consent status
             if employee:
-                current_status = employee.get("status", "")
+                current_status = await self._employee_status(employee["id"])
                 if current_status == "awaiting_consent":
                     # User has consented - update status and send outreach
-                    if supabase.client:
-                        supabase.client.table("employees").update(
-                            {
-                                "status": "consented",
-                                "sms_consent": True,
-                                "consent_timestamp": datetime.utcnow().isoformat(),
-                                "updated_at": datetime.utcnow().isoformat()
-                            }
-                        ).eq("id", employee["id"]).execute()
+                    await self._set_employee_status(
+                        employee["id"],
+                        "consented",
+                        {"sms_consent": True, "consent_timestamp": utcnow_iso()}
+                    )
                     logger.info(f"User {from_number} provided SMS consent")
 
                     # Send the actual outreach message after consent
@@ -301,69 +543,109 @@ Reply STOP to opt out anytime. Msg & data rates may apply."""
                         company_name=employee.get("company", "our team"),
                         employee_id=employee.get("id")
                     )
-                    return self.templates["consent_confirmed"]
+                    return self.replies["consent_confirmed"]
                 else:
                     # User already consented, treat as "call me now"
-                    await self._trigger_vapi_call(from_number, employee)
-                    if supabase.client:
-                        supabase.client.table("employees").update(
-                            {"status": "call_requested", "updated_at": datetime.utcnow().isoformat()}
-                        ).eq("id", employee["id"]).execute()
-                    return self.templates["call_confirmation"]
+                    await self._enqueue_vapi_call(from_number, employee)
+                    await self._set_employee_status(employee["id"], "call_requested")
+                    return self.replies["call_confirmation"]
 
         # ============================================
-        # Handle Option 1 - Call me now
+        # Handle Option 1 - Call me now (also CALL re-activation)
         # ============================================
-        if body_lower in ["1", "call", "call me", "yes call me"]:
+        if intent == "call":
             if employee:
-                await self._trigger_vapi_call(from_number, employee)
-                if supabase.client:
-                    supabase.client.table("employees").update(
-                        {"status": "call_requested", "updated_at": datetime.utcnow().isoformat()}
-                    ).eq("id", employee["id"]).execute()
-            return self.templates["call_confirmation"]
+                await self._enqueue_vapi_call(from_number, employee)
+                await self._set_employee_status(employee["id"], "call_requested")
+            return self.replies["call_confirmation"]
 
         # ============================================
         # Handle Option 2 - Schedule for later (send Cal.com link)
         # ============================================
-        if body_lower in ["2", "schedule", "later", "schedule later"]:
-            if employee and supabase.client:
-                supabase.client.table("employees").update(
-                    {"status": "scheduling", "updated_at": datetime.utcnow().isoformat()}
-                ).eq("id", employee["id"]).execute()
-            return self.templates["schedule_followup"].format(cal_link=self.cal_link)
+        if intent == "schedule":
+            if employee:
+                await self._set_employee_status(employee["id"], "scheduling")
+            return self.replies["schedule_followup"]
 
         # ============================================
         # Handle Option 3 - Not interested (but not opt-out)
         # ============================================
-        if body_lower in ["3", "no", "not interested", "no thanks"]:
-            if employee and supabase.client:
-                supabase.client.table("employees").update(
-                    {"status": "declined", "updated_at": datetime.utcnow().isoformat()}
-                ).eq("id", employee["id"]).execute()
-            return self.templates["thank_you"]
+        if intent == "decline":
+            if employee:
+                await self._set_employee_status(employee["id"], "declined")
+            return self.replies["thank_you"]
 
         # ============================================
-        # Handle CALL keyword (re-activation)
+        # Try to parse as a time/schedule (e.g. "Tuesday 2pm")
         # ============================================
-        if body_lower == "call":
-            if employee:
-                await self._trigger_vapi_call(from_number, employee)
-                if supabase.client:
-                    supabase.client.table("employees").update(
-                        {"status": "call_requested", "updated_at": datetime.utcnow().isoformat()}
-                    ).eq("id", employee["id"]).execute()
-            return self.templates["call_confirmation"]
+        match = _TIME_RE.search(body)
+        if match and employee:
+            reply = await self._schedule_from_match(match, from_number, employee)
+            if reply:
+                return reply
 
         # ============================================
         # Default response for unrecognized messages
         # ============================================
         return "Thanks for your message! Reply 1 for a call now, 2 to schedule, or 3 if not interested. Reply STOP to opt out or HELP for help."
 
+    def _next_slot(self, match: re.Match) -> Optional[datetime]:
+        """Resolve a _TIME_RE match to the next matching local datetime"""
+        hour = int(match.group("h"))
+        minute = int(match.group("m") or 0)
+        ampm = (match.group("ap") or "").lower()
+
+        if ampm == "pm" and hour < 12:
+            hour += 12
+        elif ampm == "am" and hour == 12:
+            hour = 0
+        elif not ampm and 1 <= hour < 8:
+            # "tue 3" means 3pm, not 3am
+            hour += 12
+
+        if hour > 23 or minute > 59:
+            return None
+
+        now = datetime.now(ZoneInfo(self.timezone))
+        weekday = _WEEKDAYS[match.group("day")[:3].lower()]
+        slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        slot += timedelta(days=(weekday - now.weekday()) % 7)
+        if slot <= now:
+            slot += timedelta(days=7)
+        return slot
+
+    async def _schedule_from_match(
+        self,
+        match: re.Match,
+        from_number: str,
+        employee: Dict
+    ) -> Optional[str]:
+        """Book a call at the time the employee typed and return the confirmation"""
+        slot = self._next_slot(match)
+        if not slot:
+            return None
+
+        booking = await supabase.create_booking({
+            "phone": from_number,
+            "email": employee.get("email"),
+            "preferred_time": match.group(0),
+            "scheduled_at": slot.astimezone(ZoneInfo("UTC")).isoformat(),
+            "timezone": self.timezone,
+            "platform": "sms",
+            "notes": employee.get("name", "")
+        })
+        # No id means the booking wasn't stored - the fallback sweep can't see it either
+        if self.on_booking and booking.get("id"):
+            self.on_booking(booking["id"], slot, from_number, employee.get("name", ""))
+        await self._set_employee_status(employee["id"], "scheduled")
+
+        logger.info(f"User {from_number} scheduled a call for {slot.isoformat()}")
+        return self.templates["schedule_confirmed"].substitute(
+            when=slot.strftime("%A, %b %d at %I:%M %p").replace(" 0", " ")
+        )
+
     async def _trigger_vapi_call(self, phone_number: str, employee: Dict) -> None:
         """Trigger a Vapi call to the phone number with full employee context"""
-        import aiohttp
-
         vapi_api_key = os.getenv("VAPI_API_KEY")
         vapi_assistant_id = os.getenv("VAPI_ASSISTANT_ID")
 
@@ -372,61 +654,63 @@ Reply STOP to opt out anytime. Msg & data rates may apply."""
             return
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {vapi_api_key}",
-                    "Content-Type": "application/json"
-                }
+            session = await get_session()
 
-                # Build variable values for Vapi template
-                variable_values = {
-                    "full_name": employee.get("name", ""),
-                    "company_name": employee.get("company", ""),
-                    "department": employee.get("department", ""),
-                    "position": employee.get("role", ""),
-                    "employee_id": employee.get("id", ""),
-                    "kpis": employee.get("notes", ""),  # KPIs can be stored in notes field
-                    "email": employee.get("email", ""),
-                    "phone": phone_number
-                }
+            headers = {
+                "Authorization": f"Bearer {vapi_api_key}",
+                "Content-Type": "application/json"
+            }
 
-                payload = {
-                    "phoneNumberId": os.getenv("VAPI_PHONE_NUMBER_ID"),
-                    "customer": {
-                        "number": phone_number,
-                        "name": employee.get("name", "")
-                    },
-                    "assistantOverrides": {
-                        "variableValues": variable_values
-                    }
+            # Build variable values for Vapi template
+            variable_values = {
+                "full_name": employee.get("name", ""),
+                "company_name": employee.get("company", ""),
+                "department": employee.get("department", ""),
+                "position": employee.get("role", ""),
+                "employee_id": employee.get("id", ""),
+                "kpis": employee.get("notes", ""),  # KPIs can be stored in notes field
+                "email": employee.get("email", ""),
+                "phone": phone_number
+            }
+
+            payload = {
+                "phoneNumberId": os.getenv("VAPI_PHONE_NUMBER_ID"),
+                "customer": {
+                    "number": phone_number,
+                    "name": employee.get("name", "")
+                },
+                "assistantOverrides": {
+                    "variableValues": variable_values
                 }
+            }
 
-                if vapi_assistant_id:
-                    payload["assistantId"] = vapi_assistant_id
+            if vapi_assistant_id:
+                payload["assistantId"] = vapi_assistant_id
 
-                logger.info(f"Triggering Vapi call with context: {variable_values}")
+            logger.info(f"Triggering Vapi call with context: {variable_values}")
 
-                async with session.post(
-                    "https://api.vapi.ai/call/phone",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status == 201:
-                        result = await response.json()
-                        logger.info(f"Vapi call triggered: {result.get('id')}")
-                    else:
-                        error = await response.text()
-                        logger.error(f"Failed to trigger Vapi call: {error}")
+            async with session.post(
+                "https://api.vapi.ai/call/phone",
+                headers=headers,
+                data=orjson.dumps(payload)
+            ) as response:
+                if response.status == 201:
+                    result = await response.json()
+                    logger.info(f"Vapi call triggered: {result.get('id')}")
+                else:
+                    error = await response.text()
+                    logger.error(f"Failed to trigger Vapi call: {error}")
 
         except Exception as e:
             logger.error(f"Error triggering Vapi call: {str(e)}")
 
-    async def bulk_send_consent_requests(
+    async def _bulk_send(
         self,
         employees: List[Dict],
+        send: Callable[..., Awaitable[Dict[str, Any]]],
         company_name: str
     ) -> Dict[str, Any]:
-        """Send consent request SMS to multiple employees (TFV compliant double opt-in)"""
+        """Fan out a per-employee send concurrently, bounded by SMS_CONCURRENCY"""
         results = {
             "total": len(employees),
             "sent": 0,
@@ -434,23 +718,40 @@ Reply STOP to opt out anytime. Msg & data rates may apply."""
             "errors": []
         }
 
+        sem = asyncio.Semaphore(int(os.getenv("SMS_CONCURRENCY", "20")))
+        deferred: List[Dict] = []
+
+        async def _one(employee: Dict):
+            async with sem:
+                return employee, await send(
+                    to_number=employee["phone_number"],
+                    employee_name=employee.get("name", "there"),
+                    company_name=company_name,
+                    employee_id=employee.get("id"),
+                    defer=deferred
+                )
+
+        to_send = []
         for employee in employees:
-            phone = employee.get("phone_number")
-            name = employee.get("name", "there")
-            emp_id = employee.get("id")
+            if employee.get("phone_number"):
+                to_send.append(employee)
+            else:
+                results["failed"] += 1
+                results["errors"].append(f"No phone for {employee.get('name', 'there')}")
+
+        outs = await asyncio.gather(*[_one(e) for e in to_send], return_exceptions=True)
 
-            if not phone:
+        # One batched insert for every message log instead of one per send
+        await supabase.insert("sms_messages", deferred)
+
+        for employee, out in zip(to_send, outs):
+            name = employee.get("name", "there")
+            if isinstance(out, BaseException):
                 results["failed"] += 1
-                results["errors"].append(f"No phone for {name}")
+                results["errors"].append(f"{name}: {str(out)}")
                 continue
 
-            result = await self.send_consent_request(
-                to_number=phone,
-                employee_name=name,
-                company_name=company_name,
-                employee_id=emp_id
-            )
-
+            _, result = out
             if result.get("success"):
                 results["sent"] += 1
             else:
@@ -459,43 +760,21 @@ Reply STOP to opt out anytime. Msg & data rates may apply."""
 
         return results
 
+    async def bulk_send_consent_requests(
+        self,
+        employees: List[Dict],
+        company_name: str
+    ) -> Dict[str, Any]:
+        """Send consent request SMS to multiple employees (TFV compliant double opt-in)"""
+        return await self._bulk_send(employees, self.send_consent_request, company_name)
+
     async def bulk_send_outreach(
         self,
         employees: List[Dict],
         company_name: str
     ) -> Dict[str, Any]:
         """Send outreach SMS to multiple employees (use bulk_send_consent_requests for TFV compliant flow)"""
-        results = {
-            "total": len(employees),
-            "sent": 0,
-            "failed": 0,
-            "errors": []
-        }
-
-        for employee in employees:
-            phone = employee.get("phone_number")
-            name = employee.get("name", "there")
-            emp_id = employee.get("id")
-
-            if not phone:
-                results["failed"] += 1
-                results["errors"].append(f"No phone for {name}")
-                continue
-
-            result = await self.send_initial_outreach(
-                to_number=phone,
-                employee_name=name,
-                company_name=company_name,
-                employee_id=emp_id
-            )
-
-            if result.get("success"):
-                results["sent"] += 1
-            else:
-                results["failed"] += 1
-                results["errors"].append(f"{name}: {result.get('error')}")
-
-        return results
+        return await self._bulk_send(employees, self.send_initial_outreach, company_name)
 
 
 # Initialize SMS interface
@@ -509,6 +788,11 @@ async def sms_webhook(request: Request):
     try:
         form_data = await request.form()
 
+        # Reject forged requests before doing any DB work
+        if not sms_interface.is_valid_twilio_request(request, dict(form_data)):
+            logger.warning("Rejected SMS webhook with invalid Twilio signature")
+            raise HTTPException(status_code=403, detail="Invalid Twilio signature")
+
         from_number = form_data.get("From", "")
         body = form_data.get("Body", "")
         message_sid = form_data.get("MessageSid", "")
@@ -522,42 +806,26 @@ async def sms_webhook(request: Request):
             twilio_sid=message_sid
         )
 
-        # Create TwiML response
-        response = MessagingResponse()
-        response.message(response_text)
-
-        return PlainTextResponse(
-            content=str(response),
-            media_type="application/xml"
-        )
+        return Response(content=_twiml(response_text), media_type="application/xml")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"SMS webhook error: {str(e)}")
-        response = MessagingResponse()
-        response.message("Sorry, there was an error processing your message.")
-        return PlainTextResponse(
-            content=str(response),
-            media_type="application/xml"
-        )
+        return Response(content=_TWIML_ERROR, media_type="application/xml")
 
 
 @router.post("/send")
-async def send_sms(request: Request):
+async def send_sms(body: SendSMSBody):
     """Send an SMS message"""
     try:
-        data = await request.json()
-
-        to_number = data.get("to")
-        message = data.get("message")
-        employee_id = data.get("employee_id")
-
-        if not to_number or not message:
+        if not body.to or not body.message:
             raise HTTPException(status_code=400, detail="Missing 'to' or 'message'")
 
         result = await sms_interface.send_sms(
-            to_number=to_number,
-            message=message,
-            employee_id=employee_id
+            to_number=body.to,
+            message=body.message,
+            employee_id=body.employee_id
         )
 
         if result.get("success"):
@@ -573,24 +841,17 @@ async def send_sms(request: Request):
 
 
 @router.post("/consent-request")
-async def send_consent_request(request: Request):
+async def send_consent_request(body: OutreachBody):
     """Send double opt-in consent request SMS (TFV compliant - Step 1)"""
     try:
-        data = await request.json()
-
-        to_number = data.get("phone_number")
-        employee_name = data.get("name", "there")
-        company_name = data.get("company", "our team")
-        employee_id = data.get("employee_id")
-
-        if not to_number:
+        if not body.phone_number:
             raise HTTPException(status_code=400, detail="Missing 'phone_number'")
 
         result = await sms_interface.send_consent_request(
-            to_number=to_number,
-            employee_name=employee_name,
-            company_name=company_name,
-            employee_id=employee_id
+            to_number=body.phone_number,
+            employee_name=body.name,
+            company_name=body.company,
+            employee_id=body.employee_id
         )
 
         return result
@@ -603,24 +864,17 @@ async def send_consent_request(request: Request):
 
 
 @router.post("/outreach")
-async def send_outreach(request: Request):
+async def send_outreach(body: OutreachBody):
     """Send initial outreach SMS to an employee (use /consent-request for TFV compliant flow)"""
     try:
-        data = await request.json()
-
-        to_number = data.get("phone_number")
-        employee_name = data.get("name", "there")
-        company_name = data.get("company", "our team")
-        employee_id = data.get("employee_id")
-
-        if not to_number:
+        if not body.phone_number:
             raise HTTPException(status_code=400, detail="Missing 'phone_number'")
 
         result = await sms_interface.send_initial_outreach(
-            to_number=to_number,
-            employee_name=employee_name,
-            company_name=company_name,
-            employee_id=employee_id
+            to_number=body.phone_number,
+            employee_name=body.name,
+            company_name=body.company,
+            employee_id=body.employee_id
         )
 
         return result
@@ -633,20 +887,15 @@ async def send_outreach(request: Request):
 
 
 @router.post("/bulk-consent-request")
-async def bulk_consent_request(request: Request):
+async def bulk_consent_request(body: BulkBody):
     """Send consent request SMS to multiple employees (TFV compliant - Step 1)"""
     try:
-        data = await request.json()
-
-        employees = data.get("employees", [])
-        company_name = data.get("company", "our team")
-
-        if not employees:
+        if not body.employees:
             raise HTTPException(status_code=400, detail="No employees provided")
 
         result = await sms_interface.bulk_send_consent_requests(
-            employees=employees,
-            company_name=company_name
+            employees=[emp.model_dump() for emp in body.employees],
+            company_name=body.company
         )
 
         return result
@@ -659,20 +908,15 @@ async def bulk_consent_request(request: Request):
 
 
 @router.post("/bulk-outreach")
-async def bulk_outreach(request: Request):
+async def bulk_outreach(body: BulkBody):
     """Send outreach SMS to multiple employees (use /bulk-consent-request for TFV compliant flow)"""
     try:
-        data = await request.json()
-
-        employees = data.get("employees", [])
-        company_name = data.get("company", "our team")
-
-        if not employees:
+        if not body.employees:
             raise HTTPException(status_code=400, detail="No employees provided")
 
         result = await sms_interface.bulk_send_outreach(
-            employees=employees,
-            company_name=company_name
+            employees=[emp.model_dump() for emp in body.employees],
+            company_name=body.company
         )
 
         return result
@@ -685,34 +929,29 @@ async def bulk_outreach(request: Request):
 
 
 @router.get("/messages")
-async def get_messages(limit: int = 100):
+async def get_messages(limit: int = 100, offset: int = 0):
     """Get SMS message history"""
     try:
         if not supabase.client:
             return []
 
-        # Fetch messages with employee info
-        result = await supabase.client.table("sms_messages").select(
-            "*, employees(name)"
-        ).order("created_at", desc=True).limit(limit).execute()
-
-        messages = []
-        for msg in result.data or []:
-            employee_name = None
-            if msg.get("employees"):
-                employee_name = msg["employees"].get("name")
-            messages.append({
-                "id": msg.get("id"),
-                "employee_id": msg.get("employee_id"),
-                "phone_number": msg.get("phone_number"),
-                "direction": msg.get("direction"),
-                "message": msg.get("message"),
-                "status": msg.get("status"),
-                "created_at": msg.get("created_at"),
-                "employee_name": employee_name
-            })
-
-        return messages
+        limit = max(1, min(limit, MAX_MESSAGES_PAGE))
+        offset = max(0, offset)
+
+        # Fetch only the columns the dashboard shows, with employee name
+        result = await asyncio.to_thread(
+            lambda: supabase.client.table("sms_messages").select(
+                _MESSAGE_SELECT
+            ).order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        )
+
+        return [
+            {
+                **{key: msg.get(key) for key in _MESSAGE_KEYS},
+                "employee_name": (msg.get("employees") or {}).get("name")
+            }
+            for msg in result.data or []
+        ]
 
     except Exception as e:
         logger.error(f"Get messages error: {str(e)}")
@@ -4,15 +4,18 @@ Handles Teams messaging and notifications via webhooks and Graph API
 """
 
 import os
+import re
 import json
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import uuid
-import aiohttp
+import orjson
 
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
 
 from utils.logger import setup_logger
+from interfaces.http_client import get_session
 from integrations.supabase_mcp import supabase
 
 logger = setup_logger("teams_handler")
@@ -20,6 +23,58 @@ logger = setup_logger("teams_handler")
 router = APIRouter(prefix="/teams", tags=["Microsoft Teams"])
 
 
+# Request bodies
+class TeamsSendBody(BaseModel):
+    """Body for /teams/send"""
+    message: Optional[str] = None
+    card: Optional[Dict[str, Any]] = None
+
+
+class CallNotifyBody(BaseModel):
+    """Body for /teams/notify/call"""
+    name: str = "Unknown"
+    phone: str = ""
+    status: str = "triggered"
+
+
+class TeamsOutreachBody(BaseModel):
+    """Body for /teams/outreach"""
+    name: str = "there"
+    company: str = "your company"
+
+
+# Fields shared by every MessageCard we post
+_CARD_BASE = {
+    "@type": "MessageCard",
+    "@context": "http://schema.org/extensions"
+}
+
+# Call status -> (theme color, emoji); anything else is treated as a failure
+_CALL_STYLES = {
+    "triggered": ("0076D7", "📞"),
+    "completed": ("00FF00", "✅")
+}
+_CALL_STYLE_FAILED = ("FF0000", "❌")
+
+# Placeholder marker used in pre-serialized card templates, e.g. @@employee_name@@
+_PLACEHOLDER_RE = re.compile(rb"@@(\w+)@@")
+
+
+def _compile_card(card: Dict) -> List:
+    """Serialize a card once and split it into literal bytes and placeholder names"""
+    parts = _PLACEHOLDER_RE.split(orjson.dumps(card))
+    # re.split alternates literal, group, literal, ... - decode the group names
+    return [part.decode() if i % 2 else part for i, part in enumerate(parts)]
+
+
+def _render_card(parts: List, values: Dict[str, str]) -> bytes:
+    """Splice JSON-escaped values into a compiled card"""
+    return b"".join(
+        orjson.dumps(values[part])[1:-1] if i % 2 else part
+        for i, part in enumerate(parts)
+    )
+
+
 class TeamsInterface:
     """Handles Microsoft Teams interactions with Otom"""
 
@@ -43,6 +98,47 @@ class TeamsInterface:
         # Cal.com booking link
         self.cal_link = os.getenv("CAL_BOOKING_URL", "https://cal.com/sukin-yang-vw9ds8/meet-with-otom")
 
+        # Outreach card is pre-serialized; only the names are spliced in per send
+        self._outreach_parts = _compile_card({
+            **_CARD_BASE,
+            "summary": "Process Review Request for @@employee_name@@",
+            "themeColor": "0076D7",
+            "title": "📞 Process Review Request",
+            "potentialAction": [
+                {
+                    "@type": "OpenUri",
+                    "name": "📅 Schedule Call",
+                    "targets": [
+                        {
+                            "os": "default",
+                            "uri": self.cal_link
+                        }
+                    ]
+                }
+            ],
+            "sections": [
+                {
+                    "activityTitle": "Hi @@employee_name@@!",
+                    "text": "I'm Otom, a business process consultant working with **@@company_name@@**.\n\nWe're conducting a brief workflow analysis and would love to chat with you for 10-15 minutes about your day-to-day work.",
+                    "markdown": True
+                }
+            ]
+        })
+
+        # Static card skeletons - only the dynamic fields are filled in per send
+        self._booking_skeleton = {
+            **_CARD_BASE,
+            "summary": "New Booking",
+            "themeColor": "00FF00",
+            "title": "📅 New Booking Created"
+        }
+        self._summary_skeleton = {
+            **_CARD_BASE,
+            "summary": "Daily Outreach Summary",
+            "themeColor": "0076D7",
+            "title": "📊 Daily Outreach Summary"
+        }
+
     async def send_webhook_message(
         self,
         message: str,
@@ -52,32 +148,41 @@ class TeamsInterface:
         if not self.webhook_url:
             return {"success": False, "error": "Teams webhook URL not configured"}
 
+        if card:
+            payload = card
+        else:
+            # Simple text message in Adaptive Card format
+            payload = {
+                **_CARD_BASE,
+                "summary": message[:50],
+                "themeColor": "0076D7",
+                "text": message
+            }
+
+        return await self._post_webhook(orjson.dumps(payload))
+
+    async def _post_webhook(self, body: bytes) -> Dict[str, Any]:
+        """POST an already-serialized card to the Teams webhook"""
+        if not self.webhook_url:
+            return {"success": False, "error": "Teams webhook URL not configured"}
+
         try:
-            async with aiohttp.ClientSession() as session:
-                if card:
-                    payload = card
+            session = await get_session()
+
+            async with session.post(
+                self.webhook_url,
+                data=body,
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                if response.status == 200:
+                    # Body is irrelevant on success - hand the connection back unread
+                    response.release()
+                    logger.info("Teams webhook message sent")
+                    return {"success": True}
                 else:
-                    # Simple text message in Adaptive Card format
-                    payload = {
-                        "@type": "MessageCard",
-                        "@context": "http://schema.org/extensions",
-                        "summary": message[:50],
-                        "themeColor": "0076D7",
-                        "text": message
-                    }
-
-                async with session.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    if response.status == 200:
-                        logger.info("Teams webhook message sent")
-                        return {"success": True}
-                    else:
-                        error = await response.text()
-                        logger.error(f"Teams webhook error: {error}")
-                        return {"success": False, "error": error}
+                    error = await response.text()
+                    logger.error(f"Teams webhook error: {error}")
+                    return {"success": False, "error": error}
 
         except Exception as e:
             logger.error(f"Failed to send Teams webhook: {str(e)}")
@@ -89,34 +194,12 @@ class TeamsInterface:
         company_name: str
     ) -> Dict[str, Any]:
         """Send outreach notification with action buttons"""
-        card = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "summary": f"Process Review Request for {employee_name}",
-            "themeColor": "0076D7",
-            "title": "📞 Process Review Request",
-            "sections": [
-                {
-                    "activityTitle": f"Hi {employee_name}!",
-                    "text": f"I'm Otom, a business process consultant working with **{company_name}**.\n\nWe're conducting a brief workflow analysis and would love to chat with you for 10-15 minutes about your day-to-day work.",
-                    "markdown": True
-                }
-            ],
-            "potentialAction": [
-                {
-                    "@type": "OpenUri",
-                    "name": "📅 Schedule Call",
-                    "targets": [
-                        {
-                            "os": "default",
-                            "uri": self.cal_link
-                        }
-                    ]
-                }
-            ]
-        }
+        body = _render_card(
+            self._outreach_parts,
+            {"employee_name": employee_name, "company_name": company_name}
+        )
 
-        return await self.send_webhook_message("", card)
+        return await self._post_webhook(body)
 
     async def send_call_notification(
         self,
@@ -125,21 +208,20 @@ class TeamsInterface:
         status: str = "triggered"
     ) -> Dict[str, Any]:
         """Send notification when a call is triggered"""
-        color = "00FF00" if status == "completed" else "0076D7" if status == "triggered" else "FF0000"
-        emoji = "📞" if status == "triggered" else "✅" if status == "completed" else "❌"
+        color, emoji = _CALL_STYLES.get(status, _CALL_STYLE_FAILED)
+        status_label = status.capitalize()
 
         card = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
+            **_CARD_BASE,
             "summary": f"Call {status}",
             "themeColor": color,
-            "title": f"{emoji} Call {status.capitalize()}",
+            "title": f"{emoji} Call {status_label}",
             "sections": [
                 {
                     "facts": [
                         {"name": "Employee", "value": employee_name},
                         {"name": "Phone", "value": phone_number},
-                        {"name": "Status", "value": status.capitalize()},
+                        {"name": "Status", "value": status_label},
                         {"name": "Time", "value": datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")}
                     ]
                 }
@@ -154,11 +236,7 @@ class TeamsInterface:
     ) -> Dict[str, Any]:
         """Send notification when a new booking is created"""
         card = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "summary": "New Booking",
-            "themeColor": "00FF00",
-            "title": "📅 New Booking Created",
+            **self._booking_skeleton,
             "sections": [
                 {
                     "facts": [
@@ -179,11 +257,7 @@ class TeamsInterface:
     ) -> Dict[str, Any]:
         """Send daily summary of outreach activities"""
         card = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "summary": "Daily Outreach Summary",
-            "themeColor": "0076D7",
-            "title": "📊 Daily Outreach Summary",
+            **self._summary_skeleton,
             "sections": [
                 {
                     "facts": [
@@ -209,18 +283,13 @@ teams_interface = TeamsInterface()
 # ============================================
 
 @router.post("/send")
-async def send_teams_message(request: Request):
+async def send_teams_message(body: TeamsSendBody):
     """Send a Teams message"""
     try:
-        data = await request.json()
-
-        message = data.get("message")
-        card = data.get("card")
-
-        if not message and not card:
+        if not body.message and not body.card:
             raise HTTPException(status_code=400, detail="Missing 'message' or 'card'")
 
-        result = await teams_interface.send_webhook_message(message or "", card)
+        result = await teams_interface.send_webhook_message(body.message or "", body.card)
 
         if result.get("success"):
             return result
@@ -235,15 +304,13 @@ async def send_teams_message(request: Request):
 
 
 @router.post("/notify/call")
-async def notify_call(request: Request):
+async def notify_call(body: CallNotifyBody):
     """Send call notification to Teams"""
     try:
-        data = await request.json()
-
         result = await teams_interface.send_call_notification(
-            employee_name=data.get("name", "Unknown"),
-            phone_number=data.get("phone", ""),
-            status=data.get("status", "triggered")
+            employee_name=body.name,
+            phone_number=body.phone,
+            status=body.status
         )
 
         return result
@@ -254,11 +321,10 @@ async def notify_call(request: Request):
 
 
 @router.post("/notify/booking")
-async def notify_booking(request: Request):
+async def notify_booking(booking_data: Dict[str, Any]):
     """Send booking notification to Teams"""
     try:
-        data = await request.json()
-        result = await teams_interface.send_booking_notification(data)
+        result = await teams_interface.send_booking_notification(booking_data)
         return result
 
     except Exception as e:
@@ -267,14 +333,12 @@ async def notify_booking(request: Request):
 
 
 @router.post("/outreach")
-async def send_teams_outreach(request: Request):
+async def send_teams_outreach(body: TeamsOutreachBody):
     """Send outreach card to Teams"""
     try:
-        data = await request.json()
-
         result = await teams_interface.send_outreach_card(
-            employee_name=data.get("name", "there"),
-            company_name=data.get("company", "your company")
+            employee_name=body.name,
+            company_name=body.company
         )
 
         return result
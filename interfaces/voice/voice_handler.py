@@ -4,22 +4,209 @@ Real-time conversational AI phone calls like Boardy
 """
 
 import os
-import json
+import time
 import asyncio
-from typing import Dict, Optional, Any, List
+from dataclasses import dataclass, field, fields
+from typing import Dict, Optional, Any, List, Callable, Awaitable
 import uuid
 from datetime import datetime
 
-import aiohttp
+import httpx
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, Request, Response, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from utils.logger import setup_logger
+from utils.time_utils import utcnow_iso
 from integrations.supabase_mcp import supabase
 from core.analysis.transcript_analyzer import transcript_analyzer
 
 logger = setup_logger("voice_handler")
 
+# Vapi API calls must fail fast rather than hang a webhook or request
+VAPI_TIMEOUT = httpx.Timeout(10.0, connect=3.0, read=8.0)
+
+# Backoff before each retry of an idempotent Vapi request
+VAPI_RETRY_BACKOFF = (0.2, 0.6)
+
+# Otom's voice persona; document context and the session id are appended per call
+_SYSTEM_PROMPT_PREFIX = """You are Otom, an elite AI business consultant with expertise from McKinsey, BCG, and Bain methodologies.
+
+VOICE CONVERSATION GUIDELINES:
+- Keep responses concise (2-3 sentences max) - this is a phone call, not an essay
+- Speak naturally and conversationally
+- Use verbal confirmations like "I see", "That makes sense", "Interesting"
+- Ask one question at a time
+- If you need to explain something complex, break it into parts and check for understanding
+
+YOUR APPROACH:
+1. Listen actively and understand the client's situation
+2. Ask clarifying questions to gather context
+3. Apply relevant business frameworks when appropriate
+4. Provide clear, actionable insights
+5. Be direct but empathetic
+
+CONSULTATION PHASES:
+1. Discovery - Understand the business and challenges
+2. Analysis - Identify patterns and opportunities
+3. Strategy - Develop recommendations
+4. Implementation - Create action plans
+
+IMPORTANT:
+- Never use markdown, bullet points, or formatting - this is spoken
+- Don't say "as an AI" or similar - you're Otom, a consultant
+- If they ask to schedule a follow-up, use the schedule_consultation tool
+- If they want a detailed analysis, let them know you'll send a written report after the call
+- Use the company documentation context provided below to ask smarter, more informed questions
+- Reference specific procedures or policies when relevant to the conversation"""
+
+# Pre-serialized acknowledgement for the high-frequency informational webhook events
+_OK_RESPONSE = Response(content=b'{"status":"ok"}', media_type="application/json")
+
+# Vapi events we only acknowledge - answered before any dispatch
+_PASSTHROUGH_EVENTS = frozenset({"status-update", "conversation-update", "transcript", "hang"})
+
+# Dashboard read endpoints carry phone numbers and transcripts: keep them out of shared caches
+# and have the browser revalidate (against the ETag where there is one) - caching is server-side
+_DASHBOARD_CACHE_HEADERS = {"Cache-Control": "private, no-cache"}
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already covers this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+@dataclass(slots=True)
+class CallSession:
+    """In-memory state for a tracked Vapi call"""
+    session_id: str
+    phone_number: str
+    status: str
+    call_id: Optional[str] = None
+    started_at: Optional[str] = None
+    scheduled_for: Optional[str] = None
+    ended_at: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+    # Background Supabase writes for this call that have not necessarily landed yet
+    pending: List[asyncio.Task] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe view of the session"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "pending"}
+
+
+_ENDED_STATUSES = ("completed", "ended")
+
+
+class _CallSessionCache(TTLCache):
+    """TTLCache of CallSessions that counts calls dropped before they ended"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        # Sessions evicted without an end-of-call report - a sign of lost Vapi webhooks
+        self.evicted_without_end = 0
+        # IDs of sessions that have not ended, so listing them doesn't scan the whole cache
+        self.active_ids: set = set()
+
+    def __setitem__(self, key, cs: CallSession):
+        super().__setitem__(key, cs)
+        if cs.status in _ENDED_STATUSES:
+            self.active_ids.discard(key)
+        else:
+            self.active_ids.add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.active_ids.discard(key)
+
+    def mark_ended(self, key: str) -> None:
+        """Drop a session from the active index once its status has ended"""
+        self.active_ids.discard(key)
+
+    def popitem(self):
+        key, cs = super().popitem()
+        self._note_eviction(cs)
+        return key, cs
+
+    def expire(self, time=None):
+        # Expired entries are removed without going through __delitem__
+        expired = super().expire(time)
+        for key, cs in expired:
+            self.active_ids.discard(key)
+            self._note_eviction(cs)
+        return expired
+
+    def _note_eviction(self, cs: CallSession) -> None:
+        if cs.status not in _ENDED_STATUSES:
+            self.evicted_without_end += 1
+            logger.warning(
+                f"Call session {cs.session_id} evicted without end-of-call report "
+                f"({self.evicted_without_end} so far)"
+            )
+
+
+async def _after(pending: List[asyncio.Task], coro: Awaitable[Any]) -> Any:
+    """Await coro once earlier writes for the same call have settled"""
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    return await coro
+
+
+class _SWRCache:
+    """Small async stale-while-revalidate cache for dashboard reads"""
+
+    def __init__(self, fresh: float, stale: float, maxsize: int = 256, lock_pool: int = 16):
+        self.fresh = fresh
+        self.stale = stale
+        # Keys come from query parameters, so both the entries and the locks must stay bounded
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=stale)
+        self._locks = [asyncio.Lock() for _ in range(lock_pool)]
+        self._refreshing: Dict[Any, asyncio.Task] = {}
+
+    def _lock_for(self, key: Any) -> asyncio.Lock:
+        """Lock from the fixed pool that guards fetches for key"""
+        return self._locks[hash(key) % len(self._locks)]
+
+    async def get_or_set(self, key: Any, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, fetching or refreshing it as needed"""
+        entry = self._entries.get(key)
+        if entry:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.fresh:
+                return value
+            if age < self.stale:
+                # Serve stale now; one background refresh per key
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.create_task(self._refresh(key, coro_fn))
+                return value
+
+        # Missing or too old - concurrent callers share a single upstream fetch
+        async with self._lock_for(key):
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] < self.fresh:
+                return entry[0]
+            value = await coro_fn()
+            self._entries[key] = (value, time.monotonic())
+            return value
+
+    async def _refresh(self, key: Any, coro_fn: Callable[[], Awaitable[Any]]) -> None:
+        """Background refresh of a stale entry"""
+        try:
+            async with self._lock_for(key):
+                value = await coro_fn()
+                self._entries[key] = (value, time.monotonic())
+        except Exception as e:
+            logger.error(f"Cache refresh failed for {key}: {str(e)}")
+        finally:
+            self._refreshing.pop(key, None)
+
 
 class VoiceInterface:
     """
@@ -45,13 +232,95 @@ class VoiceInterface:
         # API endpoints
         self.vapi_base_url = "https://api.vapi.ai"
 
-        # Active call sessions
-        self.active_calls: Dict[str, Dict] = {}
+        # One long-lived HTTP/2 client so concurrent Vapi requests multiplex on a single connection
+        self._vapi = httpx.AsyncClient(
+            base_url=self.vapi_base_url,
+            http2=True,
+            headers={"Authorization": f"Bearer {self.vapi_api_key}"} if self.vapi_api_key else {},
+            timeout=VAPI_TIMEOUT,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+
+        self.elevenlabs_voice_id = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
+        self.elevenlabs_model = os.getenv("ELEVENLABS_MODEL", "eleven_flash_v2_5")
+
+        # Session-independent part of the Vapi assistant config, built once
+        self._assistant_template = {
+            "name": "Otom AI Consultant",
+
+            # First message when call connects
+            "firstMessage": (
+                "Hello! I'm Otom, your AI business consultant. "
+                "I help businesses develop strategies and solve challenges. "
+                "What's on your mind today?"
+            ),
+
+            # How the conversation starts
+            "firstMessageMode": "assistant-speaks-first",
+
+            # Custom LLM endpoint - messages are filled in per call
+            "model": {
+                "provider": "custom-llm",
+                "url": f"{self.base_url}/voice/vapi/chat-completions",
+                "model": "otom-consultant",
+                "temperature": 0.7,
+                "maxTokens": 500,  # Keep responses concise for voice
+            },
+
+            # Voice configuration - use a professional voice
+            "voice": {
+                "provider": "11labs",
+                "voiceId": self.elevenlabs_voice_id,
+                "stability": 0.5,
+                "similarityBoost": 0.75,
+                "model": self.elevenlabs_model
+            },
+
+            # Transcription settings - short endpointing so turns end quickly
+            "transcriber": {
+                "provider": "deepgram",
+                "model": "nova-2",
+                "language": "en",
+                "endpointing": 200,
+                "smartFormat": True
+            },
+
+            # Conversation behavior
+            "silenceTimeoutSeconds": 30,
+            "maxDurationSeconds": 1800,  # 30 minute max call
+            "endCallMessage": "Thank you for consulting with Otom. You'll receive a summary via email. Goodbye!",
+
+            # Background sound for natural feel
+            "backgroundSound": "off",
+
+            # Enable interruptions for natural conversation
+            "backchannelingEnabled": True,
+
+            # Server URL for events
+            "serverUrl": f"{self.base_url}/voice/vapi/webhook",
+
+            # Tools Otom can use during the call
+            "tools": self._get_assistant_tools()
+        }
+
+        # Active call sessions - bounded so calls that never report an end can't leak
+        self.active_calls = _CallSessionCache(maxsize=10_000, ttl=7200)
+
+        # Cache for dashboard polling of /calls and /calls/stats
+        self._dashboard_cache = _SWRCache(fresh=30, stale=60)
 
         # Setup API routes
-        self.router = APIRouter(prefix="/voice")
+        self.router = APIRouter(prefix="/voice", default_response_class=ORJSONResponse)
         self._setup_routes()
 
+        # Vapi webhook message type -> handler
+        self._dispatch = {
+            "assistant-request": self._handle_assistant_request,
+            "function-call": self._handle_function_call,
+            "tool-calls": self._handle_tool_calls,
+            "end-of-call-report": self._handle_end_of_call_report
+        }
+
         logger.info("Vapi voice interface initialized")
 
     def _setup_routes(self):
@@ -63,6 +332,7 @@ class VoiceInterface:
 
         @self.router.get("/calls")
         async def list_calls(
+            request: Request,
             limit: int = 50,
             status: str = None,
             phone_number: str = None
@@ -72,12 +342,25 @@ class VoiceInterface:
             Used by dashboard to display call history.
             """
             try:
-                calls = await supabase.list_call_sessions(
-                    phone_number=phone_number,
-                    status=status,
-                    limit=limit
+                calls = await self._dashboard_cache.get_or_set(
+                    ("calls", limit, status, phone_number),
+                    lambda: supabase.list_call_sessions(
+                        phone_number=phone_number,
+                        status=status,
+                        limit=limit
+                    )
+                )
+                # The list changes when a row is added/removed or any row is updated
+                last_updated = max((c.get("updated_at") or "" for c in calls), default="")
+                etag = f'W/"calls-{len(calls)}-{last_updated}"'
+                headers = {**_DASHBOARD_CACHE_HEADERS, "ETag": etag}
+                if _not_modified(request, etag):
+                    return Response(status_code=304, headers=headers)
+
+                return ORJSONResponse(
+                    content={"calls": calls, "total": len(calls)},
+                    headers=headers
                 )
-                return {"calls": calls, "total": len(calls)}
             except Exception as e:
                 logger.error(f"Failed to list calls: {str(e)}")
                 raise HTTPException(status_code=500, detail=str(e))
@@ -89,41 +372,35 @@ class VoiceInterface:
             Returns aggregated metrics about calls.
             """
             try:
-                # Get all calls for the period
-                calls = await supabase.list_call_sessions(limit=1000)
-
-                # Calculate statistics
-                total_calls = len(calls)
-                completed_calls = [c for c in calls if c.get("status") == "completed"]
-                active_calls = [c for c in calls if c.get("status") in ["connecting", "in-progress", "initiated"]]
+                # Aggregated in Postgres (see migrations/006_call_stats_function.sql)
+                stats = await self._dashboard_cache.get_or_set(
+                    ("stats", days),
+                    lambda: supabase.call_stats(days)
+                )
 
-                # Calculate average duration
-                durations = [c.get("duration_seconds", 0) for c in completed_calls if c.get("duration_seconds")]
-                avg_duration = sum(durations) / len(durations) if durations else 0
+                total_calls = stats.get("total") or 0
+                completed_calls = stats.get("completed") or 0
+                avg_duration = float(stats.get("avg_duration") or 0)
 
                 # Calculate completion rate
-                completion_rate = (len(completed_calls) / total_calls * 100) if total_calls > 0 else 0
-
-                # Get calls by direction
-                inbound_calls = len([c for c in calls if c.get("direction") == "inbound"])
-                outbound_calls = len([c for c in calls if c.get("direction") == "outbound"])
+                completion_rate = (completed_calls / total_calls * 100) if total_calls > 0 else 0
 
-                return {
+                return ORJSONResponse(content={
                     "total_calls": total_calls,
-                    "completed_calls": len(completed_calls),
-                    "active_calls": len(active_calls),
+                    "completed_calls": completed_calls,
+                    "active_calls": stats.get("active") or 0,
                     "avg_duration_seconds": round(avg_duration, 1),
                     "avg_duration_formatted": f"{int(avg_duration // 60)}m {int(avg_duration % 60)}s" if avg_duration > 0 else "0m",
                     "completion_rate": round(completion_rate, 1),
-                    "inbound_calls": inbound_calls,
-                    "outbound_calls": outbound_calls
-                }
+                    "inbound_calls": stats.get("inbound") or 0,
+                    "outbound_calls": stats.get("outbound") or 0
+                }, headers=_DASHBOARD_CACHE_HEADERS)
             except Exception as e:
                 logger.error(f"Failed to get call stats: {str(e)}")
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.router.get("/calls/{session_id}")
-        async def get_call(session_id: str):
+        async def get_call(session_id: str, request: Request):
             """
             Get a single call session by ID.
             Returns full call details including transcript.
@@ -132,7 +409,13 @@ class VoiceInterface:
                 call = await supabase.get_call_session(session_id)
                 if not call:
                     raise HTTPException(status_code=404, detail="Call session not found")
-                return call
+
+                etag = f'W/"{session_id}-{call.get("updated_at", "")}"'
+                headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+                if _not_modified(request, etag):
+                    return Response(status_code=304, headers=headers)
+
+                return ORJSONResponse(content=call, headers=headers)
             except HTTPException:
                 raise
             except Exception as e:
@@ -150,35 +433,26 @@ class VoiceInterface:
             Receives all events from Vapi during calls.
             """
             try:
-                payload = await request.json()
+                payload = orjson.loads(await request.body())
                 message_type = payload.get("message", {}).get("type")
 
+                if message_type in _PASSTHROUGH_EVENTS:
+                    logger.debug(f"Vapi webhook received: {message_type}")
+                    return _OK_RESPONSE
+
                 logger.info(f"Vapi webhook received: {message_type}")
 
                 # Route to appropriate handler
-                if message_type == "assistant-request":
-                    return await self._handle_assistant_request(payload)
-                elif message_type == "function-call":
-                    return await self._handle_function_call(payload)
-                elif message_type == "tool-calls":
-                    return await self._handle_tool_calls(payload)
-                elif message_type == "end-of-call-report":
-                    return await self._handle_end_of_call_report(payload)
-                elif message_type == "status-update":
-                    return await self._handle_status_update(payload)
-                elif message_type == "conversation-update":
-                    return await self._handle_conversation_update(payload)
-                elif message_type == "transcript":
-                    return await self._handle_transcript(payload)
-                elif message_type == "hang":
-                    return await self._handle_hang(payload)
-                else:
-                    logger.debug(f"Unhandled message type: {message_type}")
-                    return JSONResponse(content={"status": "ok"})
+                handler = self._dispatch.get(message_type)
+                if handler:
+                    return await handler(payload)
+
+                logger.debug(f"Unhandled message type: {message_type}")
+                return _OK_RESPONSE
 
             except Exception as e:
                 logger.error(f"Vapi webhook error: {str(e)}")
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=500,
                     content={"error": str(e)}
                 )
@@ -195,12 +469,12 @@ class VoiceInterface:
                 return await self._handle_custom_llm_request(data)
             except Exception as e:
                 logger.error(f"Custom LLM endpoint error: {str(e)}")
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=500,
                     content={"error": str(e)}
                 )
 
-    async def _handle_assistant_request(self, payload: Dict) -> JSONResponse:
+    async def _handle_assistant_request(self, payload: Dict) -> ORJSONResponse:
         """
         Handle assistant-request event.
         Called when an inbound call comes in and we need to provide assistant config.
@@ -213,118 +487,60 @@ class VoiceInterface:
 
         # Create session for this call
         session_id = str(uuid.uuid4())
-        self.active_calls[session_id] = {
-            "phone_number": phone_number,
-            "started_at": datetime.utcnow().isoformat(),
-            "status": "connecting"
-        }
+        cs = CallSession(
+            session_id=session_id,
+            phone_number=phone_number,
+            started_at=utcnow_iso(),
+            status="connecting"
+        )
+        self.active_calls[session_id] = cs
 
         # Look up employee to get department for context
-        department = None
-        if supabase.client:
-            try:
-                result = supabase.client.table("employees").select("department").eq(
-                    "phone_number", phone_number
-                ).execute()
-                if result.data:
-                    department = result.data[0].get("department")
-            except Exception as e:
-                logger.warning(f"Could not fetch employee department: {e}")
+        matches = await supabase.query(
+            "employees", filters={"phone_number": phone_number}, columns="department", limit=1
+        )
+        department = matches[0].get("department") if matches else None
 
         # Get document context for smarter questions
         document_context = await self._get_document_context_for_call(department)
 
-        # Store in Supabase
-        await supabase.create_call_session({
-            "session_id": session_id,
-            "phone_number": phone_number,
-            "direction": "inbound",
-            "status": "connecting"
-        })
-
-        # Track analytics
-        await supabase.track_event("call_initiated", {
-            "session_id": session_id,
-            "platform": "vapi",
-            "direction": "inbound"
-        })
+        # Store in Supabase and track analytics off the response path (7.5s budget)
+        cs.pending = [
+            supabase.run_in_background(supabase.create_call_session({
+                "session_id": session_id,
+                "phone_number": phone_number,
+                "direction": "inbound",
+                "status": "connecting"
+            })),
+            supabase.run_in_background(supabase.track_event("call_initiated", {
+                "session_id": session_id,
+                "platform": "vapi",
+                "direction": "inbound"
+            }))
+        ]
 
         # Return dynamic assistant configuration with document context
         assistant_config = self._build_assistant_config(session_id, document_context)
 
-        return JSONResponse(content={"assistant": assistant_config})
+        return ORJSONResponse(content={"assistant": assistant_config})
 
     def _build_assistant_config(self, session_id: str, document_context: str = "") -> Dict:
         """
         Build Vapi assistant configuration.
         This defines how Otom behaves on the phone.
         """
-        return {
-            "name": "Otom AI Consultant",
-
-            # First message when call connects
-            "firstMessage": (
-                "Hello! I'm Otom, your AI business consultant. "
-                "I help businesses develop strategies and solve challenges. "
-                "What's on your mind today?"
-            ),
-
-            # How the conversation starts
-            "firstMessageMode": "assistant-speaks-first",
-
-            # System prompt - Otom's personality
-            "model": {
-                "provider": "custom-llm",
-                "url": f"{self.base_url}/voice/vapi/chat-completions",
-                "model": "otom-consultant",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt(session_id, document_context)
-                    }
-                ],
-                "temperature": 0.7,
-                "maxTokens": 500,  # Keep responses concise for voice
-            },
-
-            # Voice configuration - use a professional voice
-            "voice": {
-                "provider": "11labs",
-                "voiceId": os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM"),
-                "stability": 0.5,
-                "similarityBoost": 0.75,
-                "model": "eleven_turbo_v2"
-            },
-
-            # Transcription settings
-            "transcriber": {
-                "provider": "deepgram",
-                "model": "nova-2",
-                "language": "en"
-            },
-
-            # Conversation behavior
-            "silenceTimeoutSeconds": 30,
-            "maxDurationSeconds": 1800,  # 30 minute max call
-            "endCallMessage": "Thank you for consulting with Otom. You'll receive a summary via email. Goodbye!",
-
-            # Background sound for natural feel
-            "backgroundSound": "off",
-
-            # Enable interruptions for natural conversation
-            "backchannelingEnabled": True,
-
-            # Server URL for events
-            "serverUrl": f"{self.base_url}/voice/vapi/webhook",
-
-            # Metadata
-            "metadata": {
-                "session_id": session_id
-            },
-
-            # Tools Otom can use during the call
-            "tools": self._get_assistant_tools()
+        cfg = self._assistant_template.copy()
+        cfg["model"] = {
+            **self._assistant_template["model"],
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._get_system_prompt(session_id, document_context)
+                }
+            ]
         }
+        cfg["metadata"] = {"session_id": session_id}
+        return cfg
 
     async def _get_document_context_for_call(self, department: str = None) -> str:
         """Get relevant document context for the call"""
@@ -342,40 +558,7 @@ class VoiceInterface:
 
     def _get_system_prompt(self, session_id: str, document_context: str = "") -> str:
         """Get Otom's system prompt for voice conversations"""
-        base_prompt = """You are Otom, an elite AI business consultant with expertise from McKinsey, BCG, and Bain methodologies.
-
-VOICE CONVERSATION GUIDELINES:
-- Keep responses concise (2-3 sentences max) - this is a phone call, not an essay
-- Speak naturally and conversationally
-- Use verbal confirmations like "I see", "That makes sense", "Interesting"
-- Ask one question at a time
-- If you need to explain something complex, break it into parts and check for understanding
-
-YOUR APPROACH:
-1. Listen actively and understand the client's situation
-2. Ask clarifying questions to gather context
-3. Apply relevant business frameworks when appropriate
-4. Provide clear, actionable insights
-5. Be direct but empathetic
-
-CONSULTATION PHASES:
-1. Discovery - Understand the business and challenges
-2. Analysis - Identify patterns and opportunities
-3. Strategy - Develop recommendations
-4. Implementation - Create action plans
-
-IMPORTANT:
-- Never use markdown, bullet points, or formatting - this is spoken
-- Don't say "as an AI" or similar - you're Otom, a consultant
-- If they ask to schedule a follow-up, use the schedule_consultation tool
-- If they want a detailed analysis, let them know you'll send a written report after the call
-- Use the company documentation context provided below to ask smarter, more informed questions
-- Reference specific procedures or policies when relevant to the conversation"""
-
-        if document_context:
-            base_prompt += document_context
-
-        return base_prompt + f"\n\nCurrent session: {session_id}"
+        return f"{_SYSTEM_PROMPT_PREFIX}{document_context}\n\nCurrent session: {session_id}"
 
     def _get_assistant_tools(self) -> List[Dict]:
         """Define tools Otom can use during calls"""
@@ -442,34 +625,32 @@ IMPORTANT:
             }
         ]
 
-    async def _handle_custom_llm_request(self, data: Dict) -> JSONResponse:
+    async def _handle_custom_llm_request(self, data: Dict) -> ORJSONResponse:
         """
         Handle custom LLM requests from Vapi.
         Process the conversation through Otom's brain.
         """
         messages = data.get("messages", [])
 
-        # Extract session ID from the call metadata or last message
+        # Extract session ID from the system prompt; assistants configured in Vapi carry no marker
         session_id = None
         for msg in messages:
-            if msg.get("role") == "system":
-                content = msg.get("content", "")
-                if "Current session:" in content:
-                    session_id = content.split("Current session:")[-1].strip()
-                    break
+            content = msg.get("content") or ""
+            if msg.get("role") == "system" and "Current session:" in content:
+                session_id = content.rpartition("Current session:")[2].strip()
+                break
 
         if not session_id:
             session_id = str(uuid.uuid4())
 
         # Get the last user message
-        user_message = None
-        for msg in reversed(messages):
-            if msg.get("role") == "user":
-                user_message = msg.get("content")
-                break
+        user_message = next(
+            (msg.get("content") for msg in reversed(messages) if msg.get("role") == "user"),
+            None
+        )
 
         if not user_message:
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "choices": [{
                     "message": {
                         "role": "assistant",
@@ -483,11 +664,15 @@ IMPORTANT:
             response = await self.otom.process_consultation_input(session_id, user_message)
             assistant_response = response.get("response", "I understand. Tell me more about that.")
 
+            # Approximate usage from message lengths, computed once
+            prompt_len = sum(len(m.get("content") or "") for m in messages)
+            completion_len = len(assistant_response)
+
             # Return OpenAI-compatible response
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "id": f"chatcmpl-{uuid.uuid4().hex[:8]}",
                 "object": "chat.completion",
-                "created": int(datetime.utcnow().timestamp()),
+                "created": int(time.time()),
                 "model": "otom-consultant",
                 "choices": [{
                     "index": 0,
@@ -498,9 +683,9 @@ IMPORTANT:
                     "finish_reason": "stop"
                 }],
                 "usage": {
-                    "prompt_tokens": len(str(messages)),
-                    "completion_tokens": len(assistant_response),
-                    "total_tokens": len(str(messages)) + len(assistant_response)
+                    "prompt_tokens": prompt_len,
+                    "completion_tokens": completion_len,
+                    "total_tokens": prompt_len + completion_len
                 }
             })
 
@@ -509,7 +694,7 @@ IMPORTANT:
             await self.otom.start_consultation(session_id, {"phone_number": "vapi_call"})
             response = await self.otom.process_consultation_input(session_id, user_message)
 
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "choices": [{
                     "message": {
                         "role": "assistant",
@@ -518,7 +703,7 @@ IMPORTANT:
                 }]
             })
 
-    async def _handle_function_call(self, payload: Dict) -> JSONResponse:
+    async def _handle_function_call(self, payload: Dict) -> ORJSONResponse:
         """Handle function calls from Vapi"""
         message = payload.get("message", {})
         function_call = message.get("functionCall", {})
@@ -552,9 +737,9 @@ IMPORTANT:
                 "message": "I'll connect you with a human consultant. Please hold for a moment."
             }
 
-        return JSONResponse(content={"result": json.dumps(result)})
+        return ORJSONResponse(content={"result": orjson.dumps(result).decode()})
 
-    async def _handle_tool_calls(self, payload: Dict) -> JSONResponse:
+    async def _handle_tool_calls(self, payload: Dict) -> ORJSONResponse:
         """Handle tool calls from Vapi (newer format)"""
         message = payload.get("message", {})
         tool_calls = message.get("toolCalls", [])
@@ -564,7 +749,9 @@ IMPORTANT:
             tool_call_id = tool_call.get("id")
             function = tool_call.get("function", {})
             function_name = function.get("name")
-            arguments = json.loads(function.get("arguments", "{}"))
+            # Arguments arrive as a JSON string; orjson parses str directly
+            raw_arguments = function.get("arguments") or "{}"
+            arguments = raw_arguments if isinstance(raw_arguments, dict) else orjson.loads(raw_arguments)
 
             logger.info(f"Tool call: {function_name}")
 
@@ -587,9 +774,9 @@ IMPORTANT:
                 "result": result
             })
 
-        return JSONResponse(content={"results": results})
+        return ORJSONResponse(content={"results": results})
 
-    async def _handle_end_of_call_report(self, payload: Dict) -> JSONResponse:
+    async def _handle_end_of_call_report(self, payload: Dict) -> ORJSONResponse:
         """Handle end of call report from Vapi"""
         message = payload.get("message", {})
         call = message.get("call", {})
@@ -606,29 +793,18 @@ IMPORTANT:
         # Find session by call metadata
         session_id = call.get("metadata", {}).get("session_id")
         final_session_id = None
+        # Write that must land before the transcript analysis updates the row
+        record_write = None
 
-        if session_id and session_id in self.active_calls:
-            self.active_calls[session_id].update({
-                "status": "completed",
-                "ended_at": datetime.utcnow().isoformat(),
-                "duration_seconds": duration,
-                "transcript": transcript,
-                "summary": summary
-            })
-
-            # Store call completion in Supabase
-            await supabase.complete_call_session(session_id, {
-                "duration_seconds": duration,
-                "transcript": transcript,
-                "summary": summary
-            })
+        # The call is over - release its in-memory session
+        cs = self.active_calls.pop(session_id, None) if session_id else None
 
-            # Track analytics
-            await supabase.track_event("call_completed", {
-                "session_id": session_id,
-                "platform": "vapi",
-                "duration_seconds": duration
-            })
+        if cs:
+            # Store call completion and analytics in one RPC, once the session row exists
+            record_write = supabase.run_in_background(_after(
+                cs.pending,
+                supabase.complete_call(session_id, duration, transcript, summary)
+            ))
             final_session_id = session_id
         else:
             # Session not in memory - create a new call record directly
@@ -636,6 +812,7 @@ IMPORTANT:
             logger.info(f"Session {session_id} not in memory, creating new call record")
 
             new_session_id = session_id or str(uuid.uuid4())
+            now = utcnow_iso()
             call_data = {
                 "id": new_session_id,
                 "phone_number": phone_number,
@@ -646,31 +823,31 @@ IMPORTANT:
                 "transcript": transcript,
                 "summary": summary,
                 "duration_seconds": duration,
-                "started_at": datetime.utcnow().isoformat(),
-                "ended_at": datetime.utcnow().isoformat(),
+                "started_at": now,
+                "ended_at": now,
                 "metadata": call.get("metadata", {})
             }
 
             # Save directly to database
-            await supabase.create_call_session(call_data)
+            record_write = supabase.run_in_background(supabase.create_call_session(call_data))
 
             # Track analytics
-            await supabase.track_event("call_completed", {
+            supabase.run_in_background(supabase.track_event("call_completed", {
                 "session_id": new_session_id,
                 "platform": "vapi",
                 "duration_seconds": duration
-            })
+            }))
             final_session_id = new_session_id
 
         # Trigger AI analysis of transcript in background
         if transcript and len(transcript) > 100 and final_session_id:
-            asyncio.create_task(self._analyze_transcript_background(
+            supabase.run_in_background(_after([record_write], self._analyze_transcript_background(
                 final_session_id,
                 transcript,
                 phone_number
-            ))
+            )))
 
-        return JSONResponse(content={"status": "received"})
+        return ORJSONResponse(content={"status": "received"})
 
     async def _analyze_transcript_background(
         self,
@@ -683,22 +860,13 @@ IMPORTANT:
             logger.info(f"Starting AI analysis for session {session_id}")
 
             # Look up employee info by phone number for context
-            employee_name = None
-            department = None
-            role = None
-
-            if supabase.client:
-                try:
-                    result = supabase.client.table("employees").select(
-                        "name, department, role"
-                    ).eq("phone_number", phone_number).execute()
-                    if result.data:
-                        emp = result.data[0]
-                        employee_name = emp.get("name")
-                        department = emp.get("department")
-                        role = emp.get("role")
-                except Exception as e:
-                    logger.warning(f"Could not fetch employee for analysis: {e}")
+            matches = await supabase.query(
+                "employees", filters={"phone_number": phone_number}, columns="name, department, role", limit=1
+            )
+            emp = matches[0] if matches else {}
+            employee_name = emp.get("name")
+            department = emp.get("department")
+            role = emp.get("role")
 
             # Run AI analysis
             insights = await transcript_analyzer.analyze_transcript(
@@ -735,35 +903,6 @@ IMPORTANT:
             except:
                 pass
 
-    async def _handle_status_update(self, payload: Dict) -> JSONResponse:
-        """Handle status updates from Vapi"""
-        message = payload.get("message", {})
-        status = message.get("status")
-
-        logger.info(f"Call status update: {status}")
-
-        return JSONResponse(content={"status": "ok"})
-
-    async def _handle_conversation_update(self, payload: Dict) -> JSONResponse:
-        """Handle conversation updates from Vapi"""
-        # Conversation updates contain the current state of the conversation
-        # Can be used for real-time monitoring
-        return JSONResponse(content={"status": "ok"})
-
-    async def _handle_transcript(self, payload: Dict) -> JSONResponse:
-        """Handle transcript events from Vapi"""
-        message = payload.get("message", {})
-        transcript = message.get("transcript", "")
-
-        logger.debug(f"Transcript update: {transcript[:100]}...")
-
-        return JSONResponse(content={"status": "ok"})
-
-    async def _handle_hang(self, payload: Dict) -> JSONResponse:
-        """Handle hang notification from Vapi"""
-        logger.info("Call hang notification received")
-        return JSONResponse(content={"status": "ok"})
-
     async def initiate_call(self, phone_number: str) -> str:
         """
         Initiate an outbound call via Vapi API.
@@ -802,51 +941,43 @@ IMPORTANT:
                 }
             }
 
-        headers = {
-            "Authorization": f"Bearer {self.vapi_api_key}",
-            "Content-Type": "application/json"
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.vapi_base_url}/call",
-                json=call_payload,
-                headers=headers
-            ) as response:
-                if response.status != 201:
-                    error_text = await response.text()
-                    logger.error(f"Vapi call creation failed: {error_text}")
-                    raise Exception(f"Failed to create call: {error_text}")
-
-                result = await response.json()
-
-                # Track the call
-                self.active_calls[session_id] = {
-                    "call_id": result.get("id"),
-                    "phone_number": phone_number,
-                    "started_at": datetime.utcnow().isoformat(),
-                    "status": "initiating"
-                }
-
-                # Store in Supabase
-                await supabase.create_call_session({
-                    "session_id": session_id,
-                    "call_id": result.get("id"),
-                    "phone_number": phone_number,
-                    "direction": "outbound",
-                    "status": "initiating"
-                })
-
-                # Track analytics
-                await supabase.track_event("call_initiated", {
-                    "session_id": session_id,
-                    "platform": "vapi",
-                    "direction": "outbound"
-                })
+        response = await self._vapi_request("POST", "/call", call_payload)
+        if response.status_code != 201:
+            error_text = response.text
+            logger.error(f"Vapi call creation failed: {error_text}")
+            raise Exception(f"Failed to create call: {error_text}")
+
+        result = response.json()
+
+        # Track the call
+        cs = CallSession(
+            session_id=session_id,
+            call_id=result.get("id"),
+            phone_number=phone_number,
+            started_at=utcnow_iso(),
+            status="initiating"
+        )
+        self.active_calls[session_id] = cs
+
+        # Store in Supabase and track analytics without holding up the caller
+        cs.pending = [
+            supabase.run_in_background(supabase.create_call_session({
+                "session_id": session_id,
+                "call_id": result.get("id"),
+                "phone_number": phone_number,
+                "direction": "outbound",
+                "status": "initiating"
+            })),
+            supabase.run_in_background(supabase.track_event("call_initiated", {
+                "session_id": session_id,
+                "platform": "vapi",
+                "direction": "outbound"
+            }))
+        ]
 
-                logger.info(f"Initiated Vapi call to {phone_number}, session: {session_id}")
+        logger.info(f"Initiated Vapi call to {phone_number}, session: {session_id}")
 
-                return session_id
+        return session_id
 
     async def schedule_call(
         self,
@@ -872,76 +1003,97 @@ IMPORTANT:
             }
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.vapi_api_key}",
-            "Content-Type": "application/json"
-        }
+        response = await self._vapi_request("POST", "/call", call_payload)
+        if response.status_code != 201:
+            error_text = response.text
+            raise Exception(f"Failed to schedule call: {error_text}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.vapi_base_url}/call",
-                json=call_payload,
-                headers=headers
-            ) as response:
-                if response.status != 201:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to schedule call: {error_text}")
-
-                result = await response.json()
-
-                self.active_calls[session_id] = {
-                    "call_id": result.get("id"),
-                    "phone_number": phone_number,
-                    "scheduled_for": scheduled_time.isoformat(),
-                    "status": "scheduled"
-                }
+        result = response.json()
 
-                logger.info(f"Scheduled Vapi call to {phone_number} for {scheduled_time}")
+        self.active_calls[session_id] = CallSession(
+            session_id=session_id,
+            call_id=result.get("id"),
+            phone_number=phone_number,
+            scheduled_for=scheduled_time.isoformat(),
+            status="scheduled"
+        )
 
-                return session_id
+        logger.info(f"Scheduled Vapi call to {phone_number} for {scheduled_time}")
+
+        return session_id
 
     async def end_call(self, session_id: str) -> bool:
         """End an active call"""
-        call_info = self.active_calls.get(session_id)
-        if not call_info:
+        cs = self.active_calls.get(session_id)
+        if not cs:
             logger.warning(f"Call session {session_id} not found")
             return False
 
-        call_id = call_info.get("call_id")
+        call_id = cs.call_id
         if not call_id:
             return False
 
-        headers = {
-            "Authorization": f"Bearer {self.vapi_api_key}",
-            "Content-Type": "application/json"
-        }
+        # Ending a call is idempotent, so transient failures are retried
+        response = await self._vapi_request(
+            "PATCH", f"/call/{call_id}", {"status": "ended"}, retry=True
+        )
+        if response.status_code == 200:
+            cs.status = "ended"
+            self.active_calls.mark_ended(session_id)
+            logger.info(f"Ended call session {session_id}")
+            return True
+        else:
+            error_text = response.text
+            logger.error(f"Failed to end call: {error_text}")
+            return False
+
+    async def _vapi_request(
+        self,
+        method: str,
+        path: str,
+        payload: Dict,
+        retry: bool = False
+    ) -> httpx.Response:
+        """
+        Send a Vapi API request. Timeouts surface as a 504.
+        Only pass retry=True for idempotent requests - never for POST /call.
+        """
+        delays = VAPI_RETRY_BACKOFF if retry else ()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(
-                f"{self.vapi_base_url}/call/{call_id}",
-                json={"status": "ended"},
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    self.active_calls[session_id]["status"] = "ended"
-                    logger.info(f"Ended call session {session_id}")
-                    return True
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Failed to end call: {error_text}")
-                    return False
+        for attempt in range(len(delays) + 1):
+            try:
+                response = await self._vapi.request(method, path, json=payload)
+                if response.status_code < 500 or attempt == len(delays):
+                    return response
+                logger.warning(f"Vapi {method} {path} returned {response.status_code}, retrying")
+            except httpx.TransportError as e:
+                if attempt == len(delays):
+                    if isinstance(e, httpx.TimeoutException):
+                        logger.error(f"Vapi {method} {path} timed out")
+                        raise HTTPException(status_code=504, detail="vapi upstream timeout")
+                    raise
+                logger.warning(f"Vapi {method} {path} failed: {str(e)}, retrying")
+
+            await asyncio.sleep(delays[attempt])
+
+    async def aclose(self) -> None:
+        """Close the pooled Vapi HTTP client"""
+        await self._vapi.aclose()
 
     def get_call_status(self, session_id: str) -> Optional[Dict]:
         """Get status of an active call"""
-        return self.active_calls.get(session_id)
+        cs = self.active_calls.get(session_id)
+        return cs.to_dict() if cs else None
 
     async def list_active_calls(self) -> List[Dict]:
         """List all active calls"""
-        return [
-            {"session_id": sid, **info}
-            for sid, info in self.active_calls.items()
-            if info.get("status") not in ["completed", "ended"]
-        ]
+        calls = []
+        for session_id in list(self.active_calls.active_ids):
+            # get() skips sessions whose TTL lapsed but haven't been purged yet
+            cs = self.active_calls.get(session_id)
+            if cs is not None:
+                calls.append(cs.to_dict())
+        return calls
 
     async def create_assistant(self) -> Dict:
         """
@@ -968,26 +1120,17 @@ IMPORTANT:
             },
             "voice": {
                 "provider": "11labs",
-                "voiceId": os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
+                "voiceId": self.elevenlabs_voice_id,
+                "model": self.elevenlabs_model
             },
             "serverUrl": f"{self.base_url}/voice/vapi/webhook"
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.vapi_api_key}",
-            "Content-Type": "application/json"
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.vapi_base_url}/assistant",
-                json=assistant_config,
-                headers=headers
-            ) as response:
-                if response.status == 201:
-                    result = await response.json()
-                    logger.info(f"Created Vapi assistant: {result.get('id')}")
-                    return result
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to create assistant: {error_text}")
+        response = await self._vapi_request("POST", "/assistant", assistant_config)
+        if response.status_code == 201:
+            result = response.json()
+            logger.info(f"Created Vapi assistant: {result.get('id')}")
+            return result
+        else:
+            error_text = response.text
+            raise Exception(f"Failed to create assistant: {error_text}")
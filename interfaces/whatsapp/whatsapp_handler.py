@@ -4,33 +4,90 @@ Handles WhatsApp messaging via Twilio WhatsApp API
 """
 
 import os
-import json
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import asyncio
+from string import Template
+from typing import Dict, List, Any, Optional, AsyncIterator
 import uuid
+import orjson
+import httpx
+from cachetools import TTLCache
 
+from aiolimiter import AsyncLimiter
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, ORJSONResponse, StreamingResponse
 
-# Handle Twilio import gracefully
+# Handle Twilio import gracefully (only needed for TwiML replies; sends use the REST API)
 try:
-    from twilio.rest import Client
     from twilio.twiml.messaging_response import MessagingResponse
     TWILIO_AVAILABLE = True
 except ImportError:
-    Client = None
     MessagingResponse = None
     TWILIO_AVAILABLE = False
 
 from utils.logger import setup_logger
-from integrations.supabase_mcp import supabase
+from utils.time_utils import utcnow_iso
+from interfaces.http_client import request_with_retry
+from integrations.supabase_mcp import supabase, MAX_BATCH
 
 logger = setup_logger("whatsapp_handler")
 
 if not TWILIO_AVAILABLE:
-    logger.warning("Twilio package not installed - WhatsApp features unavailable")
+    logger.warning("Twilio package not installed - WhatsApp webhook replies unavailable")
 
-router = APIRouter(prefix="/whatsapp", tags=["WhatsApp"])
+router = APIRouter(prefix="/whatsapp", tags=["WhatsApp"], default_response_class=ORJSONResponse)
+
+# Twilio caps WhatsApp text throughput at 25 messages/sec per sender
+WHATSAPP_MPS = 25
+
+# Outbound Vapi calls: at most this many in flight and started per second
+VAPI_MAX_CONCURRENCY = 10
+VAPI_CALLS_PER_SEC = 10
+
+# Employee rows keyed by phone number, so repeat correspondents skip the lookup
+_EMPLOYEE_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# Twilio addresses WhatsApp numbers as 'whatsapp:+15551234567'
+WA_PREFIX = "whatsapp:"
+_WA_PREFIX_LEN = len(WA_PREFIX)
+
+
+def _ensure_wa(number: str) -> str:
+    """Return the number in Twilio's whatsapp: address form"""
+    return number if number.startswith(WA_PREFIX) else WA_PREFIX + number
+
+
+def _strip_wa(number: str) -> str:
+    """Return the bare phone number without the whatsapp: prefix"""
+    return number[_WA_PREFIX_LEN:] if number.startswith(WA_PREFIX) else number
+
+
+# Vapi request headers keyed by API key, so the dict is only built when the key changes
+_VAPI_HEADERS: Dict[str, Dict[str, str]] = {}
+
+
+def _vapi_headers(api_key: str) -> Dict[str, str]:
+    """Return the (shared, read-only) Vapi request headers for an API key"""
+    headers = _VAPI_HEADERS.get(api_key)
+    if headers is None:
+        headers = _VAPI_HEADERS[api_key] = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+    return headers
+
+
+def _uuid_batch(n: int) -> List[str]:
+    """Generate n random (v4) UUID strings from a single urandom read"""
+    buf = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=buf[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
+# Normalized reply body -> intent
+KEYWORD_TO_INTENT = {
+    "1": "call", "yes": "call", "call": "call", "call me": "call",
+    "2": "schedule", "schedule": "schedule", "later": "schedule",
+    "3": "decline", "no": "decline", "not interested": "decline", "stop": "decline"
+}
 
 
 class WhatsAppInterface:
@@ -41,11 +98,18 @@ class WhatsAppInterface:
         self.account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         self.auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         # WhatsApp numbers are prefixed with 'whatsapp:'
-        self.whatsapp_number = os.getenv("TWILIO_WHATSAPP_NUMBER", "whatsapp:+14155238886")
-
-        # Initialize Twilio client if credentials are available
-        if self.account_sid and self.auth_token and TWILIO_AVAILABLE:
-            self.client = Client(self.account_sid, self.auth_token)
+        self.whatsapp_number = _ensure_wa(os.getenv("TWILIO_WHATSAPP_NUMBER", "whatsapp:+14155238886"))
+
+        # Messages are sent with a pooled async HTTP client instead of the
+        # blocking SDK, so sends never stall the event loop.
+        if self.account_sid and self.auth_token:
+            self.client = httpx.AsyncClient(
+                http2=True,
+                auth=(self.account_sid, self.auth_token),
+                base_url=f"https://api.twilio.com/2010-04-01/Accounts/{self.account_sid}/",
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                limits=httpx.Limits(max_connections=WHATSAPP_MPS, max_keepalive_connections=WHATSAPP_MPS)
+            )
             logger.info("Twilio WhatsApp interface initialized")
         else:
             self.client = None
@@ -54,11 +118,20 @@ class WhatsAppInterface:
         # Cal.com booking link
         self.cal_link = os.getenv("CAL_BOOKING_URL", "https://cal.com/sukin-yang-vw9ds8/meet-with-otom")
 
+        # Token bucket shared by every send so bursts stay under Twilio's rate cap
+        self._send_limiter = AsyncLimiter(WHATSAPP_MPS, 1)
+
+        # "Call me" replies are queued and placed by a fixed pool of workers
+        self._vapi_q: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._vapi_workers: List[asyncio.Task] = []
+        self._vapi_sem = asyncio.Semaphore(VAPI_MAX_CONCURRENCY)
+        self._vapi_limiter = AsyncLimiter(VAPI_CALLS_PER_SEC, 1)
+
         # Message templates
         self.templates = {
-            "initial_outreach": """Hi {name}! 👋
+            "initial_outreach": Template("""Hi $name! 👋
 
-I'm Otom, a business process consultant working with {company}.
+I'm Otom, a business process consultant working with $company.
 
 We're reaching out to learn about your workflows and gather feedback.
 
@@ -69,92 +142,144 @@ Reply:
 *2* - Schedule for later
 *3* - Not interested
 
-Thank you!""",
+Thank you!"""),
 
-            "schedule_followup": """Great! 📅
+            "schedule_followup": Template("""Great! 📅
 
 Pick a time that works for you:
-{cal_link}
+$cal_link
 
-Just click the link and choose a slot. We'll call you at the scheduled time!""",
+Just click the link and choose a slot. We'll call you at the scheduled time!"""),
 
-            "call_confirmation": """Perfect! ✅
+            "call_confirmation": Template("""Perfect! ✅
 
 You'll receive a call from Otom shortly.
 
-The call will take about 10-15 minutes. We appreciate your time!""",
+The call will take about 10-15 minutes. We appreciate your time!"""),
 
-            "thank_you": """Thank you for your response. 🙏
+            "thank_you": Template("""Thank you for your response. 🙏
 
-We appreciate your time! If you change your mind, just send "CALL" and we'll reach out."""
+We appreciate your time! If you change your mind, just send "CALL" and we'll reach out.""")
+        }
+
+        # Replies without per-recipient fields are rendered once
+        self.replies = {
+            key: self.templates[key].substitute(cal_link=self.cal_link)
+            for key in ("schedule_followup", "call_confirmation", "thank_you")
         }
 
     async def send_whatsapp(
         self,
         to_number: str,
         message: str,
-        employee_id: Optional[str] = None
+        employee_id: Optional[str] = None,
+        defer: Optional[List[Dict]] = None,
+        record_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Send a WhatsApp message"""
+        """Send a WhatsApp message (append the log record to `defer` to batch-insert it later)"""
         if not self.client:
             logger.error("Twilio client not initialized")
             return {"success": False, "error": "WhatsApp not configured"}
 
         try:
             # Ensure proper WhatsApp format
-            if not to_number.startswith("whatsapp:"):
-                to_number = f"whatsapp:{to_number}"
+            phone_number = _strip_wa(to_number)
+            to_number = WA_PREFIX + phone_number
 
             # Send the message
-            twilio_message = self.client.messages.create(
-                body=message,
-                from_=self.whatsapp_number,
-                to=to_number
-            )
+            async with self._send_limiter:
+                response = await self.client.post(
+                    "Messages.json",
+                    data={"To": to_number, "From": self.whatsapp_number, "Body": message}
+                )
+            result = orjson.loads(response.content)
+
+            if response.status_code >= 400:
+                error = result.get("message", response.text)
+                logger.error(f"Twilio API error: {error}")
+                return {"success": False, "error": error}
 
             # Log to Supabase
             wa_record = {
-                "id": str(uuid.uuid4()),
+                "id": record_id or str(uuid.uuid4()),
                 "employee_id": employee_id,
-                "phone_number": to_number.replace("whatsapp:", ""),
+                "phone_number": phone_number,
                 "direction": "outbound",
                 "message": message,
-                "twilio_sid": twilio_message.sid,
-                "status": twilio_message.status,
+                "twilio_sid": result["sid"],
+                "status": result["status"],
                 "platform": "whatsapp",
-                "created_at": datetime.utcnow().isoformat()
+                "created_at": utcnow_iso()
             }
 
-            if supabase.client:
-                try:
-                    supabase.client.table("whatsapp_messages").insert(wa_record).execute()
-                except Exception as e:
-                    logger.warning(f"Failed to log WhatsApp message: {e}")
+            if defer is not None:
+                defer.append(wa_record)
+            else:
+                await supabase.insert("whatsapp_messages", wa_record)
 
-            logger.info(f"WhatsApp sent to {to_number}: {twilio_message.sid}")
+            logger.info(f"WhatsApp sent to {to_number}: {result['sid']}")
             return {
                 "success": True,
-                "message_sid": twilio_message.sid,
-                "status": twilio_message.status
+                "message_sid": result["sid"],
+                "status": result["status"]
             }
 
         except Exception as e:
             logger.error(f"Failed to send WhatsApp: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    def start_vapi_workers(self) -> None:
+        """Start the background Vapi call workers (called from app startup)"""
+        self._vapi_workers = [t for t in self._vapi_workers if not t.done()]
+        while len(self._vapi_workers) < VAPI_MAX_CONCURRENCY:
+            self._vapi_workers.append(asyncio.create_task(self._vapi_worker()))
+        logger.info("WhatsApp Vapi call workers started")
+
+    async def _vapi_worker(self) -> None:
+        """Place queued call requests one at a time"""
+        while True:
+            phone_number, employee = await self._vapi_q.get()
+            try:
+                await self._trigger_vapi_call(phone_number, employee)
+            finally:
+                self._vapi_q.task_done()
+
+    async def _enqueue_vapi_call(self, phone_number: str, employee: Dict) -> None:
+        """Queue a Vapi call, or place it inline if the workers can't take it"""
+        if any(not t.done() for t in self._vapi_workers):
+            try:
+                self._vapi_q.put_nowait((phone_number, employee))
+                return
+            except asyncio.QueueFull:
+                logger.warning("Vapi call queue full - triggering call inline")
+
+        await self._trigger_vapi_call(phone_number, employee)
+
+    async def aclose(self) -> None:
+        """Stop the Vapi workers and close the pooled Twilio HTTP client"""
+        for task in self._vapi_workers:
+            task.cancel()
+        await asyncio.gather(*self._vapi_workers, return_exceptions=True)
+        self._vapi_workers = []
+
+        if self.client:
+            await self.client.aclose()
+
     async def send_initial_outreach(
         self,
         to_number: str,
         employee_name: str,
         company_name: str,
-        employee_id: str
+        employee_id: str,
+        defer: Optional[List[Dict]] = None,
+        record_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Send initial outreach WhatsApp to an employee"""
-        message = self.templates["initial_outreach"].format(
+        message = self.templates["initial_outreach"].substitute(
             name=employee_name,
             company=company_name
         )
-        return await self.send_whatsapp(to_number, message, employee_id)
+        return await self.send_whatsapp(to_number, message, employee_id, defer, record_id)
 
     async def handle_incoming_whatsapp(
         self,
@@ -164,8 +289,10 @@ We appreciate your time! If you change your mind, just send "CALL" and we'll rea
     ) -> str:
         """Handle incoming WhatsApp and return response"""
         # Remove whatsapp: prefix for lookup
-        phone_number = from_number.replace("whatsapp:", "")
-        body_lower = body.strip().lower()
+        phone_number = _strip_wa(from_number)
+        intent = KEYWORD_TO_INTENT.get(body.strip().lower())
+        # One timestamp for the message log and any status update
+        now_iso = utcnow_iso()
 
         # Log incoming message
         wa_record = {
@@ -176,58 +303,68 @@ We appreciate your time! If you change your mind, just send "CALL" and we'll rea
             "twilio_sid": twilio_sid,
             "status": "received",
             "platform": "whatsapp",
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": now_iso
         }
 
-        # Find employee by phone number
-        employee = None
-        if supabase.client:
-            try:
-                supabase.client.table("whatsapp_messages").insert(wa_record).execute()
-            except Exception as e:
-                logger.warning(f"Failed to log incoming WhatsApp: {e}")
+        if intent == "decline":
+            # User not interested - one UPDATE keyed by phone, no employee lookup
+            _EMPLOYEE_CACHE.pop(phone_number, None)
+            await asyncio.gather(
+                supabase.insert("whatsapp_messages", wa_record),
+                supabase.update(
+                    "employees",
+                    {"status": "declined", "updated_at": now_iso},
+                    {"phone_number": phone_number}
+                )
+            )
+            return self.replies["thank_you"]
 
-            # Try to find the employee
-            result = supabase.client.table("employees").select("*").eq("phone_number", phone_number).execute()
-            if result.data:
-                employee = result.data[0]
-                wa_record["employee_id"] = employee.get("id")
+        # Log the message and find the employee concurrently
+        _, employee = await asyncio.gather(
+            supabase.insert("whatsapp_messages", wa_record),
+            self._lookup_employee(phone_number)
+        )
 
         # Determine response based on input
-        if body_lower in ["1", "yes", "call", "call me"]:
+        if intent == "call":
             # User wants a call now - trigger Vapi call
             if employee:
-                await self._trigger_vapi_call(phone_number, employee)
-                if supabase.client:
-                    supabase.client.table("employees").update(
-                        {"status": "call_requested", "updated_at": datetime.utcnow().isoformat()}
-                    ).eq("id", employee["id"]).execute()
-            return self.templates["call_confirmation"]
-
-        elif body_lower in ["2", "schedule", "later"]:
+                await self._enqueue_vapi_call(phone_number, employee)
+                await supabase.update(
+                    "employees",
+                    {"status": "call_requested", "updated_at": now_iso},
+                    {"id": employee["id"]}
+                )
+            return self.replies["call_confirmation"]
+
+        elif intent == "schedule":
             # User wants to schedule - send Cal.com link
-            if employee and supabase.client:
-                supabase.client.table("employees").update(
-                    {"status": "scheduling", "updated_at": datetime.utcnow().isoformat()}
-                ).eq("id", employee["id"]).execute()
-            return self.templates["schedule_followup"].format(cal_link=self.cal_link)
-
-        elif body_lower in ["3", "no", "not interested", "stop"]:
-            # User not interested
-            if employee and supabase.client:
-                supabase.client.table("employees").update(
-                    {"status": "declined", "updated_at": datetime.utcnow().isoformat()}
-                ).eq("id", employee["id"]).execute()
-            return self.templates["thank_you"]
+            if employee:
+                await supabase.update(
+                    "employees",
+                    {"status": "scheduling", "updated_at": now_iso},
+                    {"id": employee["id"]}
+                )
+            return self.replies["schedule_followup"]
 
         else:
             # Default response
             return "Thanks for your message! Reply *1* for a call now, *2* to schedule, or *3* if not interested."
 
+    async def _lookup_employee(self, phone: str) -> Optional[Dict]:
+        """Find an employee by phone number, served from a short-lived cache"""
+        employee = _EMPLOYEE_CACHE.get(phone)
+        if employee is not None:
+            return employee
+
+        matches = await supabase.query("employees", filters={"phone_number": phone})
+        employee = matches[0] if matches else None
+        if employee is not None:
+            _EMPLOYEE_CACHE[phone] = employee
+        return employee
+
     async def _trigger_vapi_call(self, phone_number: str, employee: Dict) -> None:
         """Trigger a Vapi call to the phone number with full employee context"""
-        import aiohttp
-
         vapi_api_key = os.getenv("VAPI_API_KEY")
         vapi_assistant_id = os.getenv("VAPI_ASSISTANT_ID")
         vapi_phone_id = os.getenv("VAPI_PHONE_NUMBER_ID")
@@ -237,47 +374,45 @@ We appreciate your time! If you change your mind, just send "CALL" and we'll rea
             return
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {vapi_api_key}",
-                    "Content-Type": "application/json"
-                }
-
-                # Build variable values for Vapi template
-                variable_values = {
-                    "full_name": employee.get("name", ""),
-                    "company_name": employee.get("company", ""),
-                    "department": employee.get("department", ""),
-                    "position": employee.get("role", ""),
-                    "employee_id": employee.get("id", ""),
-                    "kpis": employee.get("notes", ""),
-                    "email": employee.get("email", ""),
-                    "phone": phone_number
-                }
+            # Build variable values for Vapi template
+            variable_values = {
+                "full_name": employee.get("name", ""),
+                "company_name": employee.get("company", ""),
+                "department": employee.get("department", ""),
+                "position": employee.get("role", ""),
+                "employee_id": employee.get("id", ""),
+                "kpis": employee.get("notes", ""),
+                "email": employee.get("email", ""),
+                "phone": phone_number
+            }
 
-                payload = {
-                    "phoneNumberId": vapi_phone_id,
-                    "customer": {
-                        "number": phone_number,
-                        "name": employee.get("name", "")
-                    },
-                    "assistantOverrides": {
-                        "variableValues": variable_values
-                    }
+            payload = {
+                "phoneNumberId": vapi_phone_id,
+                "customer": {
+                    "number": phone_number,
+                    "name": employee.get("name", "")
+                },
+                "assistantOverrides": {
+                    "variableValues": variable_values
                 }
+            }
 
-                if vapi_assistant_id:
-                    payload["assistantId"] = vapi_assistant_id
+            if vapi_assistant_id:
+                payload["assistantId"] = vapi_assistant_id
 
-                logger.info(f"Triggering Vapi call from WhatsApp: {variable_values}")
+            logger.info(f"Triggering Vapi call from WhatsApp: {variable_values}")
 
-                async with session.post(
+            # Bounded and rate-limited so a burst of replies can't flood Vapi
+            async with self._vapi_sem, self._vapi_limiter:
+                # Only 429s are retried - never re-POST a call that may have been placed
+                async with await request_with_retry(
+                    "POST",
                     "https://api.vapi.ai/call/phone",
-                    headers=headers,
-                    json=payload
+                    headers=_vapi_headers(vapi_api_key),
+                    data=orjson.dumps(payload)
                 ) as response:
                     if response.status == 201:
-                        result = await response.json()
+                        result = orjson.loads(await response.read())
                         logger.info(f"Vapi call triggered from WhatsApp: {result.get('id')}")
                     else:
                         error = await response.text()
@@ -286,12 +421,76 @@ We appreciate your time! If you change your mind, just send "CALL" and we'll rea
         except Exception as e:
             logger.error(f"Error triggering Vapi call: {str(e)}")
 
+    async def iter_bulk_outreach(
+        self,
+        employees: List[Dict],
+        company_name: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Send outreach WhatsApp concurrently, yielding each employee's result as it completes"""
+        sem = asyncio.Semaphore(int(os.getenv("WHATSAPP_CONCURRENCY", str(WHATSAPP_MPS))))
+        deferred: List[Dict] = []
+
+        async def _one(employee: Dict, record_id: str):
+            try:
+                async with sem:
+                    result = await self.send_initial_outreach(
+                        to_number=employee["phone_number"],
+                        employee_name=employee.get("name", "there"),
+                        company_name=company_name,
+                        employee_id=employee.get("id"),
+                        defer=deferred,
+                        record_id=record_id
+                    )
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            return employee.get("name", "there"), result
+
+        to_send = []
+        for employee in employees:
+            if employee.get("phone_number"):
+                to_send.append(employee)
+            else:
+                name = employee.get("name", "there")
+                yield {"name": name, "status": "failed", "error": f"No phone for {name}"}
+
+        # Log row ids for the whole batch from one entropy read
+        record_ids = _uuid_batch(len(to_send))
+        tasks = [asyncio.create_task(_one(e, rid)) for e, rid in zip(to_send, record_ids)]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                name, result = await next_done
+
+                # Message logs are batch-inserted a chunk at a time as sends complete
+                if len(deferred) >= MAX_BATCH:
+                    batch = deferred[:]
+                    deferred.clear()
+                    await supabase.insert("whatsapp_messages", batch)
+
+                if result.get("success"):
+                    yield {"name": name, "status": "sent"}
+                else:
+                    yield {"name": name, "status": "failed", "error": result.get("error")}
+
+            await supabase.insert("whatsapp_messages", deferred)
+
+        finally:
+            # The consumer went away mid-run - let the sends finish and still log them
+            pending = [t for t in tasks if not t.done()]
+            if pending:
+                supabase.run_in_background(self._finish_bulk(pending, deferred))
+
+    async def _finish_bulk(self, pending: List[asyncio.Task], deferred: List[Dict]) -> None:
+        """Wait out an abandoned bulk run, then insert its message logs"""
+        await asyncio.gather(*pending, return_exceptions=True)
+        await supabase.insert("whatsapp_messages", deferred)
+
     async def bulk_send_outreach(
         self,
         employees: List[Dict],
         company_name: str
     ) -> Dict[str, Any]:
-        """Send outreach WhatsApp to multiple employees"""
+        """Send outreach WhatsApp to multiple employees concurrently, bounded by WHATSAPP_CONCURRENCY"""
         results = {
             "total": len(employees),
             "sent": 0,
@@ -299,28 +498,12 @@ We appreciate your time! If you change your mind, just send "CALL" and we'll rea
             "errors": []
         }
 
-        for employee in employees:
-            phone = employee.get("phone_number")
-            name = employee.get("name", "there")
-            emp_id = employee.get("id")
-
-            if not phone:
-                results["failed"] += 1
-                results["errors"].append(f"No phone for {name}")
-                continue
-
-            result = await self.send_initial_outreach(
-                to_number=phone,
-                employee_name=name,
-                company_name=company_name,
-                employee_id=emp_id
-            )
-
-            if result.get("success"):
+        async for item in self.iter_bulk_outreach(employees, company_name):
+            if item["status"] == "sent":
                 results["sent"] += 1
             else:
                 results["failed"] += 1
-                results["errors"].append(f"{name}: {result.get('error')}")
+                results["errors"].append(f"{item['name']}: {item['error']}")
 
         return results
 
@@ -375,7 +558,7 @@ async def whatsapp_webhook(request: Request):
 async def send_whatsapp(request: Request):
     """Send a WhatsApp message"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
 
         to_number = data.get("to")
         message = data.get("message")
@@ -406,7 +589,7 @@ async def send_whatsapp(request: Request):
 async def send_whatsapp_outreach(request: Request):
     """Send initial outreach WhatsApp to an employee"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
 
         to_number = data.get("phone_number")
         employee_name = data.get("name", "there")
@@ -434,9 +617,9 @@ async def send_whatsapp_outreach(request: Request):
 
 @router.post("/bulk-outreach")
 async def bulk_whatsapp_outreach(request: Request):
-    """Send outreach WhatsApp to multiple employees"""
+    """Send outreach WhatsApp to multiple employees, streaming one NDJSON line per result"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
 
         employees = data.get("employees", [])
         company_name = data.get("company", "our team")
@@ -444,12 +627,19 @@ async def bulk_whatsapp_outreach(request: Request):
         if not employees:
             raise HTTPException(status_code=400, detail="No employees provided")
 
-        result = await whatsapp_interface.bulk_send_outreach(
-            employees=employees,
-            company_name=company_name
-        )
-
-        return result
+        async def _ndjson():
+            sent = failed = 0
+            async for item in whatsapp_interface.iter_bulk_outreach(employees, company_name):
+                if item["status"] == "sent":
+                    sent += 1
+                else:
+                    failed += 1
+                yield orjson.dumps(item) + b"\n"
+            # Final line carries the totals the non-streaming response used to return
+            yield orjson.dumps({"total": len(employees), "sent": sent, "failed": failed}) + b"\n"
+
+        # Excluded from gzip in main.py so each line reaches the client as it is produced
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
 
     except HTTPException:
         raise
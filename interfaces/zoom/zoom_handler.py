@@ -4,21 +4,83 @@ Handles Zoom meeting creation and management
 """
 
 import os
-import json
+import time
+import logging
+import asyncio
+import functools
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
-import aiohttp
+import hmac
 import base64
+import hashlib
+import orjson
+import aiohttp
+from cachetools import TTLCache
 
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, Response, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 
 from utils.logger import setup_logger
+from utils.time_utils import utcnow_iso
+from interfaces.http_client import request_with_retry
 from integrations.supabase_mcp import supabase
 
 logger = setup_logger("zoom_handler")
 
-router = APIRouter(prefix="/zoom", tags=["Zoom"])
+router = APIRouter(prefix="/zoom", tags=["Zoom"], default_response_class=ORJSONResponse)
+
+
+# Request bodies
+class CreateMeetingRequest(BaseModel):
+    """Body for /zoom/meetings"""
+    topic: str = "Otom Consultation"
+    start_time: Optional[datetime] = None
+    duration: int = 30
+    agenda: str = ""
+    invitees: List[str] = []
+
+
+class ConsultationMeetingRequest(BaseModel):
+    """Body for /zoom/consultation-meeting"""
+    name: str = "Guest"
+    company: str = "Company"
+    email: Optional[str] = None
+    start_time: Optional[datetime] = None
+
+
+class ZoomAPIError(HTTPException):
+    """A failed Zoom operation; FastAPI turns it into an error response directly"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code=status_code, detail=detail)
+
+
+# Zoom tokens live 60 minutes; refresh ahead of expiry so requests never wait on OAuth
+TOKEN_REFRESH_INTERVAL = 50 * 60
+TOKEN_RETRY_INTERVAL = 60
+# Treat a token as expired this many seconds before Zoom's expires_in says it is
+TOKEN_EXPIRY_MARGIN = 60
+
+# Zoom calls share the pooled session but fail fast instead of its 5 minute default
+ZOOM_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)
+
+# Reject signed webhooks whose timestamp is further than this from now (replay guard)
+WEBHOOK_MAX_SKEW = 5 * 60
+
+# Fallback error details for when Zoom's error body carries no message
+_MEETING_NOT_FOUND = "Meeting not found"
+_ZOOM_REQUEST_FAILED = "Zoom request failed"
+
+# Every successful webhook gets the same ACK, so its bytes are built once
+_OK_RESPONSE = Response(content=b'{"status":"ok"}', media_type="application/json")
+
+# Shared read-only fallback for missing webhook fields - never mutate
+_EMPTY: Dict[str, Any] = {}
+
+# Meeting details are polled by the UI but rarely change between polls
+MEETING_CACHE_TTL = 30
 
 
 class ZoomInterface:
@@ -29,56 +91,138 @@ class ZoomInterface:
         self.account_id = os.getenv("ZOOM_ACCOUNT_ID")
         self.client_id = os.getenv("ZOOM_CLIENT_ID")
         self.client_secret = os.getenv("ZOOM_CLIENT_SECRET")
+        # Secret token from the Zoom app's Feature > Event Subscriptions page
+        webhook_secret = os.getenv("ZOOM_WEBHOOK_SECRET_TOKEN")
+        self._webhook_secret = webhook_secret.encode() if webhook_secret else None
 
         self.access_token = None
-        self.token_expires = None
-
+        # time.monotonic() deadline, immune to wall-clock adjustments
+        self.token_expires = 0.0
+        # Request headers for the current token, rebuilt only when the token rotates
+        self._auth_headers: Dict[str, str] = {}
+        self._auth_headers_get: Dict[str, str] = {}
+        # Serializes token fetches so concurrent requests don't stampede the OAuth endpoint
+        self._token_lock = asyncio.Lock()
+        self._token_refresh_task: Optional[asyncio.Task] = None
+
+        # Successful get_meeting results keyed by meeting ID
+        self._meeting_cache: TTLCache = TTLCache(maxsize=1024, ttl=MEETING_CACHE_TTL)
+
+        # Basic auth for the OAuth endpoint - credentials never change at runtime
+        self._token_headers: Dict[str, str] = {}
         if self.client_id and self.client_secret:
+            credentials = base64.b64encode(
+                f"{self.client_id}:{self.client_secret}".encode()
+            ).decode()
+            self._token_headers = {
+                "Authorization": f"Basic {credentials}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            }
             logger.info("Zoom interface initialized")
         else:
             logger.warning("Zoom credentials not configured")
 
+        if not self._webhook_secret:
+            logger.warning("ZOOM_WEBHOOK_SECRET_TOKEN not set - Zoom webhook signatures are not verified")
+
+    def start_token_refresh(self) -> None:
+        """Start the background token refresh loop (called from app startup)"""
+        if not self.client_id or not self.client_secret or not self.account_id:
+            return
+        if self._token_refresh_task is None or self._token_refresh_task.done():
+            self._token_refresh_task = asyncio.create_task(self._token_refresh_loop())
+            logger.info("Zoom token refresh loop started")
+
+    async def _token_refresh_loop(self) -> None:
+        """Keep a fresh access token cached ahead of expiry"""
+        while True:
+            async with self._token_lock:
+                token = await self._fetch_access_token()
+            await asyncio.sleep(TOKEN_REFRESH_INTERVAL if token else TOKEN_RETRY_INTERVAL)
+
+    async def aclose(self) -> None:
+        """Stop the token refresh loop"""
+        if self._token_refresh_task is not None:
+            self._token_refresh_task.cancel()
+            try:
+                await self._token_refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._token_refresh_task = None
+
+    def is_valid_webhook(self, request: Request, body: bytes) -> bool:
+        """Check the x-zm-signature header against the raw body (skipped when no secret is set)"""
+        if not self._webhook_secret:
+            return True
+
+        timestamp = request.headers.get("x-zm-request-timestamp", "")
+        signature = request.headers.get("x-zm-signature", "")
+        if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > WEBHOOK_MAX_SKEW:
+            return False
+
+        message = b"v0:" + timestamp.encode() + b":" + body
+        expected = "v0=" + hmac.new(self._webhook_secret, message, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    def url_validation_response(self, plain_token: str) -> Dict[str, str]:
+        """Answer Zoom's endpoint.url_validation challenge"""
+        encrypted = hmac.new(self._webhook_secret or b"", plain_token.encode(), hashlib.sha256).hexdigest()
+        return {"plainToken": plain_token, "encryptedToken": encrypted}
+
+    async def _require_token(self) -> str:
+        """Return a valid access token or raise ZoomAPIError"""
+        token = await self._get_access_token()
+        if not token:
+            raise ZoomAPIError(500, "Failed to authenticate with Zoom")
+        return token
+
+    def _token_valid(self) -> bool:
+        return bool(self.access_token) and time.monotonic() < self.token_expires
+
     async def _get_access_token(self) -> Optional[str]:
         """Get Zoom OAuth access token using Server-to-Server OAuth"""
         if not self.client_id or not self.client_secret or not self.account_id:
             return None
 
         # Check if we have a valid token
-        if self.access_token and self.token_expires and datetime.utcnow() < self.token_expires:
+        if self._token_valid():
             return self.access_token
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                # Create Basic auth header
-                credentials = base64.b64encode(
-                    f"{self.client_id}:{self.client_secret}".encode()
-                ).decode()
-
-                headers = {
-                    "Authorization": f"Basic {credentials}",
-                    "Content-Type": "application/x-www-form-urlencoded"
-                }
+        async with self._token_lock:
+            # Another request may have refreshed it while we waited
+            if self._token_valid():
+                return self.access_token
+            return await self._fetch_access_token()
 
-                data = {
-                    "grant_type": "account_credentials",
-                    "account_id": self.account_id
-                }
-
-                async with session.post(
-                    "https://zoom.us/oauth/token",
-                    headers=headers,
-                    data=data
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        self.access_token = result.get("access_token")
-                        # Token expires in 1 hour, refresh at 55 minutes
-                        self.token_expires = datetime.utcnow() + timedelta(minutes=55)
-                        return self.access_token
-                    else:
-                        error = await response.text()
-                        logger.error(f"Zoom OAuth error: {error}")
-                        return None
+    async def _fetch_access_token(self) -> Optional[str]:
+        """Request a new access token from Zoom (caller holds _token_lock)"""
+        try:
+            data = {
+                "grant_type": "account_credentials",
+                "account_id": self.account_id
+            }
+
+            # Token requests are idempotent, so server errors are retried too
+            async with await request_with_retry(
+                "POST",
+                "https://zoom.us/oauth/token",
+                retry_5xx=True,
+                timeout=ZOOM_TIMEOUT,
+                headers=self._token_headers,
+                data=data
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    self.access_token = result.get("access_token")
+                    self._auth_headers_get = {"Authorization": f"Bearer {self.access_token}"}
+                    self._auth_headers = {**self._auth_headers_get, "Content-Type": "application/json"}
+                    expires_in = result.get("expires_in", 3600)
+                    self.token_expires = time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN
+                    return self.access_token
+                else:
+                    error = await response.text()
+                    logger.error(f"Zoom OAuth error: {error}")
+                    return None
 
         except Exception as e:
             logger.error(f"Failed to get Zoom access token: {str(e)}")
@@ -92,84 +236,77 @@ class ZoomInterface:
         agenda: str = "",
         invitees: List[str] = None
     ) -> Dict[str, Any]:
-        """Create a Zoom meeting"""
-        token = await self._get_access_token()
-        if not token:
-            return {"success": False, "error": "Failed to authenticate with Zoom"}
+        """Create a Zoom meeting (raises ZoomAPIError on failure)"""
+        await self._require_token()
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
+            # Meeting settings
+            meeting_data = {
+                "topic": topic,
+                "type": 2 if start_time else 1,  # 2 = scheduled, 1 = instant
+                "duration": duration,
+                "timezone": "UTC",
+                "agenda": agenda or f"Process review call with Otom",
+                "settings": {
+                    "host_video": True,
+                    "participant_video": True,
+                    "join_before_host": True,
+                    "mute_upon_entry": False,
+                    "waiting_room": False,
+                    "meeting_authentication": False
                 }
-
-                # Meeting settings
-                meeting_data = {
-                    "topic": topic,
-                    "type": 2 if start_time else 1,  # 2 = scheduled, 1 = instant
-                    "duration": duration,
-                    "timezone": "UTC",
-                    "agenda": agenda or f"Process review call with Otom",
-                    "settings": {
-                        "host_video": True,
-                        "participant_video": True,
-                        "join_before_host": True,
-                        "mute_upon_entry": False,
-                        "waiting_room": False,
-                        "meeting_authentication": False
+            }
+
+            if start_time:
+                meeting_data["start_time"] = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+            if invitees:
+                meeting_data["settings"]["meeting_invitees"] = [
+                    {"email": email} for email in invitees
+                ]
+
+            # Only 429s are retried - a 5xx may still have created the meeting
+            async with await request_with_retry(
+                "POST",
+                "https://api.zoom.us/v2/users/me/meetings",
+                timeout=ZOOM_TIMEOUT,
+                headers=self._auth_headers,
+                data=orjson.dumps(meeting_data)
+            ) as response:
+                if response.status == 201:
+                    result = orjson.loads(await response.read())
+                    logger.info(f"Zoom meeting created: {result.get('id')}")
+
+                    # Store in database without holding up the join URL
+                    supabase.insert_background("zoom_meetings", {
+                        "id": str(uuid.uuid4()),
+                        "zoom_meeting_id": str(result.get("id")),
+                        "topic": topic,
+                        "join_url": result.get("join_url"),
+                        "start_url": result.get("start_url"),
+                        "password": result.get("password"),
+                        "start_time": start_time.isoformat() if start_time else None,
+                        "duration": duration,
+                        "created_at": utcnow_iso()
+                    })
+
+                    return {
+                        "success": True,
+                        "meeting_id": result.get("id"),
+                        "join_url": result.get("join_url"),
+                        "start_url": result.get("start_url"),
+                        "password": result.get("password")
                     }
-                }
-
-                if start_time:
-                    meeting_data["start_time"] = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-                if invitees:
-                    meeting_data["settings"]["meeting_invitees"] = [
-                        {"email": email} for email in invitees
-                    ]
-
-                async with session.post(
-                    "https://api.zoom.us/v2/users/me/meetings",
-                    headers=headers,
-                    json=meeting_data
-                ) as response:
-                    if response.status == 201:
-                        result = await response.json()
-                        logger.info(f"Zoom meeting created: {result.get('id')}")
-
-                        # Store in database
-                        if supabase.client:
-                            try:
-                                supabase.client.table("zoom_meetings").insert({
-                                    "id": str(uuid.uuid4()),
-                                    "zoom_meeting_id": str(result.get("id")),
-                                    "topic": topic,
-                                    "join_url": result.get("join_url"),
-                                    "start_url": result.get("start_url"),
-                                    "password": result.get("password"),
-                                    "start_time": start_time.isoformat() if start_time else None,
-                                    "duration": duration,
-                                    "created_at": datetime.utcnow().isoformat()
-                                }).execute()
-                            except Exception as e:
-                                logger.warning(f"Failed to store Zoom meeting: {e}")
-
-                        return {
-                            "success": True,
-                            "meeting_id": result.get("id"),
-                            "join_url": result.get("join_url"),
-                            "start_url": result.get("start_url"),
-                            "password": result.get("password")
-                        }
-                    else:
-                        error = await response.json()
-                        logger.error(f"Zoom API error: {error}")
-                        return {"success": False, "error": error.get("message", "Failed to create meeting")}
+                else:
+                    error = await response.json()
+                    logger.error(f"Zoom API error: {error}")
+                    raise ZoomAPIError(500, error.get("message") or "Failed to create meeting")
 
+        except ZoomAPIError:
+            raise
         except Exception as e:
             logger.error(f"Failed to create Zoom meeting: {str(e)}")
-            return {"success": False, "error": str(e)}
+            raise ZoomAPIError(500, str(e))
 
     async def create_consultation_meeting(
         self,
@@ -203,188 +340,192 @@ This call is part of {company_name}'s process optimization initiative."""
         )
 
     async def get_meeting(self, meeting_id: str) -> Dict[str, Any]:
-        """Get meeting details"""
-        token = await self._get_access_token()
-        if not token:
-            return {"success": False, "error": "Failed to authenticate with Zoom"}
+        """Get meeting details (raises ZoomAPIError on failure)"""
+        cached = self._meeting_cache.get(meeting_id)
+        if cached is not None:
+            return cached
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"Authorization": f"Bearer {token}"}
-
-                async with session.get(
-                    f"https://api.zoom.us/v2/meetings/{meeting_id}",
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return {"success": True, "meeting": result}
-                    else:
-                        error = await response.json()
-                        return {"success": False, "error": error.get("message")}
+        await self._require_token()
 
+        try:
+            async with await request_with_retry(
+                "GET",
+                f"https://api.zoom.us/v2/meetings/{meeting_id}",
+                retry_5xx=True,
+                timeout=ZOOM_TIMEOUT,
+                headers=self._auth_headers_get
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    meeting = {"success": True, "meeting": result}
+                    self._meeting_cache[meeting_id] = meeting
+                    return meeting
+                else:
+                    error = await response.json()
+                    raise ZoomAPIError(404, error.get("message") or _MEETING_NOT_FOUND)
+
+        except ZoomAPIError:
+            raise
         except Exception as e:
             logger.error(f"Failed to get Zoom meeting: {str(e)}")
-            return {"success": False, "error": str(e)}
+            raise ZoomAPIError(500, str(e))
 
     async def delete_meeting(self, meeting_id: str) -> Dict[str, Any]:
-        """Delete a meeting"""
-        token = await self._get_access_token()
-        if not token:
-            return {"success": False, "error": "Failed to authenticate with Zoom"}
+        """Delete a meeting (raises ZoomAPIError on failure)"""
+        self._meeting_cache.pop(meeting_id, None)
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"Authorization": f"Bearer {token}"}
-
-                async with session.delete(
-                    f"https://api.zoom.us/v2/meetings/{meeting_id}",
-                    headers=headers
-                ) as response:
-                    if response.status == 204:
-                        logger.info(f"Zoom meeting deleted: {meeting_id}")
-                        return {"success": True}
-                    else:
-                        error = await response.json()
-                        return {"success": False, "error": error.get("message")}
+        await self._require_token()
 
+        try:
+            async with await request_with_retry(
+                "DELETE",
+                f"https://api.zoom.us/v2/meetings/{meeting_id}",
+                retry_5xx=True,
+                timeout=ZOOM_TIMEOUT,
+                headers=self._auth_headers_get
+            ) as response:
+                if response.status == 204:
+                    logger.info(f"Zoom meeting deleted: {meeting_id}")
+                    return {"success": True}
+                else:
+                    error = await response.json()
+                    raise ZoomAPIError(500, error.get("message") or _ZOOM_REQUEST_FAILED)
+
+        except ZoomAPIError:
+            raise
         except Exception as e:
             logger.error(f"Failed to delete Zoom meeting: {str(e)}")
-            return {"success": False, "error": str(e)}
+            raise ZoomAPIError(500, str(e))
 
 
 # Initialize Zoom interface
 zoom_interface = ZoomInterface()
 
+# Credentials are read once at startup, so the /config body is serialized once too
+_CONFIG_BODY = orjson.dumps({
+    "ZOOM_ACCOUNT_ID": "set" if zoom_interface.account_id else "MISSING",
+    "ZOOM_CLIENT_ID": "set" if zoom_interface.client_id else "MISSING",
+    "ZOOM_CLIENT_SECRET": "set" if zoom_interface.client_secret else "MISSING"
+})
+
+
+def zoom_endpoint(fn):
+    """Pass HTTPExceptions through; log anything else and turn it into a 500"""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception("Zoom %s error", fn.__name__)
+            raise HTTPException(status_code=500, detail=str(e))
+    return wrapper
+
 
 # ============================================
 # API Routes
 # ============================================
 
 @router.post("/meetings")
-async def create_meeting(request: Request):
+@zoom_endpoint
+async def create_meeting(body: CreateMeetingRequest):
     """Create a Zoom meeting"""
-    try:
-        data = await request.json()
-
-        topic = data.get("topic", "Otom Consultation")
-        start_time = None
-        if data.get("start_time"):
-            start_time = datetime.fromisoformat(data["start_time"].replace("Z", "+00:00"))
-        duration = data.get("duration", 30)
-        agenda = data.get("agenda", "")
-        invitees = data.get("invitees", [])
-
-        result = await zoom_interface.create_meeting(
-            topic=topic,
-            start_time=start_time,
-            duration=duration,
-            agenda=agenda,
-            invitees=invitees
-        )
-
-        if result.get("success"):
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Create meeting error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await zoom_interface.create_meeting(
+        topic=body.topic,
+        start_time=body.start_time,
+        duration=body.duration,
+        agenda=body.agenda,
+        invitees=body.invitees
+    )
+    return ORJSONResponse(content=result)
 
 
 @router.post("/consultation-meeting")
-async def create_consultation_meeting(request: Request):
+@zoom_endpoint
+async def create_consultation_meeting(body: ConsultationMeetingRequest):
     """Create a consultation meeting for an employee"""
-    try:
-        data = await request.json()
-
-        employee_name = data.get("name", "Guest")
-        company_name = data.get("company", "Company")
-        employee_email = data.get("email")
-        start_time = None
-        if data.get("start_time"):
-            start_time = datetime.fromisoformat(data["start_time"].replace("Z", "+00:00"))
-
-        result = await zoom_interface.create_consultation_meeting(
-            employee_name=employee_name,
-            company_name=company_name,
-            start_time=start_time,
-            employee_email=employee_email
-        )
-
-        if result.get("success"):
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Create consultation meeting error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await zoom_interface.create_consultation_meeting(
+        employee_name=body.name,
+        company_name=body.company,
+        start_time=body.start_time,
+        employee_email=body.email
+    )
+    return ORJSONResponse(content=result)
 
 
 @router.get("/meetings/{meeting_id}")
+@zoom_endpoint
 async def get_meeting(meeting_id: str):
     """Get meeting details"""
-    result = await zoom_interface.get_meeting(meeting_id)
-
-    if result.get("success"):
-        return result
-    else:
-        raise HTTPException(status_code=404, detail=result.get("error"))
+    return ORJSONResponse(content=await zoom_interface.get_meeting(meeting_id))
 
 
 @router.delete("/meetings/{meeting_id}")
+@zoom_endpoint
 async def delete_meeting(meeting_id: str):
     """Delete a meeting"""
-    result = await zoom_interface.delete_meeting(meeting_id)
+    return ORJSONResponse(content=await zoom_interface.delete_meeting(meeting_id))
 
-    if result.get("success"):
-        return result
-    else:
-        raise HTTPException(status_code=500, detail=result.get("error"))
+
+def _on_meeting_started(obj: Dict[str, Any]) -> None:
+    logger.info("Meeting started: %s", obj.get("id"))
+
+
+def _on_meeting_ended(obj: Dict[str, Any]) -> None:
+    logger.info("Meeting ended: %s, duration: %s minutes", obj.get("id"), obj.get("duration"))
+
+
+def _on_participant_joined(obj: Dict[str, Any]) -> None:
+    participant = obj.get("participant") or _EMPTY
+    logger.info("Participant joined: %s", participant.get("user_name"))
+
+
+# Webhook event -> handler taking the payload's "object"
+_WEBHOOK_HANDLERS = {
+    "meeting.started": _on_meeting_started,
+    "meeting.ended": _on_meeting_ended,
+    "meeting.participant_joined": _on_participant_joined
+}
 
 
 @router.post("/webhook")
 async def zoom_webhook(request: Request):
     """Handle Zoom webhooks"""
+    body = await request.body()
+
+    # Reject forged requests before spending anything on parsing
+    if not zoom_interface.is_valid_webhook(request, body):
+        logger.warning("Rejected Zoom webhook with invalid signature")
+        raise HTTPException(status_code=401, detail="Invalid Zoom signature")
+
     try:
-        data = await request.json()
+        data = orjson.loads(body)
 
         event = data.get("event")
-        payload = data.get("payload", {})
+        payload = data.get("payload") or _EMPTY
 
-        logger.info(f"Zoom webhook received: {event}")
+        if event == "endpoint.url_validation":
+            return ORJSONResponse(content=zoom_interface.url_validation_response(payload.get("plainToken", "")))
 
-        if event == "meeting.started":
-            meeting_id = payload.get("object", {}).get("id")
-            logger.info(f"Meeting started: {meeting_id}")
+        # The remaining events are only logged, so skip the lookups when INFO is off
+        if not logger.isEnabledFor(logging.INFO):
+            return _OK_RESPONSE
 
-        elif event == "meeting.ended":
-            meeting_id = payload.get("object", {}).get("id")
-            duration = payload.get("object", {}).get("duration")
-            logger.info(f"Meeting ended: {meeting_id}, duration: {duration} minutes")
+        logger.info("Zoom webhook received: %s", event)
 
-        elif event == "meeting.participant_joined":
-            participant = payload.get("object", {}).get("participant", {})
-            logger.info(f"Participant joined: {participant.get('user_name')}")
+        handler = _WEBHOOK_HANDLERS.get(event)
+        if handler is not None:
+            handler(payload.get("object") or _EMPTY)
 
-        return {"status": "ok"}
+        return _OK_RESPONSE
 
     except Exception as e:
-        logger.error(f"Zoom webhook error: {str(e)}")
-        return {"status": "error", "message": str(e)}
+        logger.error("Zoom webhook error: %s", e)
+        return ORJSONResponse(content={"status": "error", "message": str(e)})
 
 
 @router.get("/config")
 async def get_zoom_config():
     """Check Zoom configuration status"""
-    return {
-        "ZOOM_ACCOUNT_ID": "set" if os.getenv("ZOOM_ACCOUNT_ID") else "MISSING",
-        "ZOOM_CLIENT_ID": "set" if os.getenv("ZOOM_CLIENT_ID") else "MISSING",
-        "ZOOM_CLIENT_SECRET": "set" if os.getenv("ZOOM_CLIENT_SECRET") else "MISSING"
-    }
+    return Response(content=_CONFIG_BODY, media_type="application/json")
@@ -4,24 +4,34 @@ Voice-first AI business consultant using Whisper (STT) + Sesame (TTS)
 """
 
 import os
+import uuid
 import asyncio
+import functools
+import orjson
+from datetime import datetime, timedelta
+from typing import List
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Request, Response, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from dotenv import load_dotenv
 import uvicorn
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.jobstores.base import JobLookupError
+from cachetools import TTLCache
 
 from core.consultant.otom_brain import OtomConsultant
 from interfaces.voice.voice_handler import VoiceInterface
 from interfaces.chat.chat_handler import ChatInterface
 from interfaces.email.email_handler import EmailInterface, email_router
-from interfaces.sms.sms_handler import router as sms_router
-from interfaces.whatsapp.whatsapp_handler import router as whatsapp_router
+from interfaces.sms.sms_handler import router as sms_router, sms_interface
+from interfaces.whatsapp.whatsapp_handler import router as whatsapp_router, whatsapp_interface
 from interfaces.slack.slack_handler import router as slack_router
 from interfaces.teams.teams_handler import router as teams_router
-from interfaces.zoom.zoom_handler import router as zoom_router
+from interfaces.zoom.zoom_handler import router as zoom_router, zoom_interface
+from interfaces.http_client import get_session, close_session
+from integrations.supabase_mcp import supabase
 from utils.logger import setup_logger
 
 # Load environment variables
@@ -33,55 +43,162 @@ logger = setup_logger("otom_main")
 # Scheduler for cron jobs
 scheduler = AsyncIOScheduler()
 
+# Cap on concurrent Vapi call triggers to stay under Vapi's rate limit
+_VAPI_CALL_LIMIT = asyncio.Semaphore(10)
+
+# Fallback sweep for booking calls whose scheduled job failed or never existed
+FALLBACK_SWEEP_MINUTES = 5
+FALLBACK_LOOKBACK_MINUTES = 15
+
+async def claim_bookings(booking_ids: List[str]) -> List[str]:
+    """Move bookings from scheduled to calling, returns the ids this caller won"""
+    # Conditional on status, so the date job and the fallback sweep never dial the same booking
+    claimed = await supabase.update(
+        "bookings", {"status": "calling"}, {"id": booking_ids, "status": "scheduled"}
+    )
+    return [row["id"] for row in claimed]
+
+async def settle_bookings(triggered_ids: List[str], failed_ids: List[str]):
+    """Record call outcomes; failed bookings go back to scheduled for the fallback sweep"""
+    if triggered_ids:
+        await supabase.update("bookings", {"status": "call_triggered"}, {"id": triggered_ids})
+        logger.info(f"Scheduled calls triggered for bookings {triggered_ids}")
+    if failed_ids:
+        await supabase.update("bookings", {"status": "scheduled"}, {"id": failed_ids})
+
+async def trigger_due_bookings(lookback_minutes: int = 2, lookahead_minutes: int = 2) -> int:
+    """Trigger calls for bookings due in the current window, returns the number triggered"""
+    now = datetime.utcnow()
+    window_start = (now - timedelta(minutes=lookback_minutes)).isoformat()
+    window_end = (now + timedelta(minutes=lookahead_minutes)).isoformat()
+
+    # Get pending bookings in the current time window
+    result = await asyncio.to_thread(
+        lambda: supabase.client.table("bookings").select("id, client_phone, notes").eq(
+            "status", "scheduled"
+        ).gte("scheduled_at", window_start).lte("scheduled_at", window_end).execute()
+    )
+
+    bookings = {b["id"]: b for b in result.data or [] if b.get("client_phone")}
+    if not bookings:
+        return 0
+
+    claimed = [bookings[booking_id] for booking_id in await claim_bookings(list(bookings))]
+
+    # Vapi calls are independent - fan them out, bounded inside trigger_scheduled_call
+    results = await asyncio.gather(
+        *(trigger_scheduled_call(b["client_phone"], b.get("notes", "")) for b in claimed),
+        return_exceptions=True
+    )
+
+    triggered_ids = [b["id"] for b, success in zip(claimed, results) if success is True]
+    failed_ids = [b["id"] for b, success in zip(claimed, results) if success is not True]
+    await settle_bookings(triggered_ids, failed_ids)
+
+    return len(triggered_ids)
+
+async def call_booking(booking_id: str, phone_number: str, name: str = "") -> bool:
+    """Claim a booking, trigger its Vapi call and record the outcome"""
+    if not booking_id or not supabase.client:
+        return await trigger_scheduled_call(phone_number, name)
+
+    if not await claim_bookings([booking_id]):
+        logger.info(f"Booking {booking_id} already claimed, skipping call")
+        return False
+
+    success = await trigger_scheduled_call(phone_number, name)
+    await settle_bookings([booking_id] if success else [], [] if success else [booking_id])
+    return success
+
+def schedule_booking_call(booking_id: str, run_date: datetime, phone_number: str, name: str = ""):
+    """Schedule a one-off Vapi call at the booking's start time"""
+    scheduler.add_job(
+        call_booking,
+        'date',
+        run_date=run_date,
+        args=[booking_id, phone_number, name],
+        id=booking_id,
+        replace_existing=True,
+        # Same slack the old per-minute window allowed
+        misfire_grace_time=120
+    )
+
 async def check_scheduled_calls():
-    """Background job to trigger scheduled calls every minute"""
-    from datetime import datetime, timedelta
-    from integrations.supabase_mcp import supabase
+    """Fallback job that retries booking calls still pending after their start time"""
 
     if not supabase.client:
         return
 
     try:
-        now = datetime.utcnow()
-        window_start = (now - timedelta(minutes=2)).isoformat()
-        window_end = (now + timedelta(minutes=2)).isoformat()
+        # Only bookings at least a minute past due, so calls whose job is running now are left alone
+        await trigger_due_bookings(lookback_minutes=FALLBACK_LOOKBACK_MINUTES, lookahead_minutes=-1)
 
-        # Get pending bookings in the current time window
-        result = supabase.client.table("bookings").select("*").eq(
-            "status", "scheduled"
-        ).gte("scheduled_at", window_start).lte("scheduled_at", window_end).execute()
+    except Exception as e:
+        logger.error(f"Error in scheduled call check: {e}")
 
+async def schedule_pending_bookings():
+    """Re-create call jobs for upcoming bookings, which are lost when the process restarts"""
+    if not supabase.client:
+        return
+
+    try:
+        window_start = (datetime.utcnow() - timedelta(minutes=2)).isoformat()
+        result = await asyncio.to_thread(
+            lambda: supabase.client.table("bookings").select(
+                "id, client_phone, scheduled_at, notes"
+            ).eq("status", "scheduled").gte("scheduled_at", window_start).execute()
+        )
+
+        scheduled = 0
         for booking in result.data or []:
-            phone = booking.get("client_phone")
-            if phone:
-                # Import here to avoid circular imports
-                success = await trigger_scheduled_call(phone, booking.get("notes", ""))
-                if success:
-                    supabase.client.table("bookings").update(
-                        {"status": "call_triggered"}
-                    ).eq("id", booking["id"]).execute()
-                    logger.info(f"Scheduled call triggered for booking {booking['id']}")
+            if booking.get("id") and booking.get("client_phone") and booking.get("scheduled_at"):
+                schedule_booking_call(
+                    booking["id"],
+                    datetime.fromisoformat(booking["scheduled_at"]),
+                    booking["client_phone"],
+                    booking.get("notes", "")
+                )
+                scheduled += 1
+
+        logger.info(f"Scheduled calls for {scheduled} upcoming bookings")
 
     except Exception as e:
-        logger.error(f"Error in scheduled call check: {e}")
+        logger.error(f"Error scheduling pending bookings: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    # Start the scheduler
-    scheduler.add_job(check_scheduled_calls, 'interval', minutes=1)
+    # Make a silent fallback to the stock asyncio loop visible in the logs
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+    # Warm the shared outbound HTTP session
+    await get_session()
+    # Start the SMS and WhatsApp -> Vapi call workers
+    sms_interface.start_vapi_worker()
+    whatsapp_interface.start_vapi_workers()
+    # Keep a Zoom OAuth token warm
+    zoom_interface.start_token_refresh()
+    # Start the scheduler; calls are queued per booking by the Cal.com webhook and SMS replies,
+    # with a low-frequency sweep retrying any that failed
+    sms_interface.on_booking = schedule_booking_call
+    scheduler.add_job(check_scheduled_calls, 'interval', minutes=FALLBACK_SWEEP_MINUTES)
     scheduler.start()
-    logger.info("Scheduled call checker started (runs every minute)")
+    await schedule_pending_bookings()
     yield
     # Shutdown
     scheduler.shutdown()
+    await close_session()
+    await sms_interface.aclose()
+    await whatsapp_interface.aclose()
+    await zoom_interface.aclose()
+    await voice_interface.aclose()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Otom AI Consultant",
     description="AI-powered business consultant with voice-first interface",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Setup CORS
@@ -93,6 +210,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the given path prefixes through untouched"""
+
+    def __init__(self, app, exclude_paths=(), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress larger JSON bodies (e.g. Zoom meeting details); level 5 keeps CPU per response low.
+# Streaming endpoints are excluded - gzip would buffer their lines
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    exclude_paths=("/whatsapp/bulk-outreach",),
+    minimum_size=1000,
+    compresslevel=5
+)
+
 # Initialize logger
 logger = setup_logger("otom_main")
 
@@ -108,7 +247,6 @@ email_interface = EmailInterface(otom)
 async def root():
     """Health check endpoint"""
     try:
-        from integrations.supabase_mcp import supabase
         db_status = "connected" if supabase.client else "not configured"
     except Exception:
         db_status = "error"
@@ -135,6 +273,8 @@ async def start_consultation(phone_number: str):
             "session_id": session_id,
             "message": "Otom will call you shortly for your consultation"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to start consultation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -163,37 +303,67 @@ async def get_consultation_status(session_id: str):
         logger.error(f"Failed to get consultation status: {str(e)}")
         raise HTTPException(status_code=404, detail="Session not found")
 
+# Static catalogue, serialized once at import
+_SERVICES_BODY = orjson.dumps({
+    "services": [
+        {
+            "name": "Quick Assessment",
+            "description": "48-hour business analysis with actionable recommendations",
+            "price": "$500",
+            "deliverables": ["Discovery call", "5-page report", "3 key recommendations"]
+        },
+        {
+            "name": "Strategic Planning",
+            "description": "Comprehensive strategy development for your business",
+            "price": "$2,500",
+            "deliverables": ["3 strategy sessions", "Full strategy deck", "Implementation roadmap", "30-day follow-up"]
+        },
+        {
+            "name": "Transformation Partner",
+            "description": "Full-service consulting engagement",
+            "price": "$10,000",
+            "deliverables": ["Weekly consultations", "Complete business analysis", "Custom frameworks", "Ongoing support"]
+        }
+    ]
+})
+
 @app.get("/services")
 async def get_services():
     """Get list of available consulting services"""
-    return {
-        "services": [
-            {
-                "name": "Quick Assessment",
-                "description": "48-hour business analysis with actionable recommendations",
-                "price": "$500",
-                "deliverables": ["Discovery call", "5-page report", "3 key recommendations"]
-            },
-            {
-                "name": "Strategic Planning",
-                "description": "Comprehensive strategy development for your business",
-                "price": "$2,500",
-                "deliverables": ["3 strategy sessions", "Full strategy deck", "Implementation roadmap", "30-day follow-up"]
-            },
-            {
-                "name": "Transformation Partner",
-                "description": "Full-service consulting engagement",
-                "price": "$10,000",
-                "deliverables": ["Weekly consultations", "Complete business analysis", "Custom frameworks", "Ongoing support"]
-            }
-        ]
-    }
+    return Response(content=_SERVICES_BODY, media_type="application/json")
+
+# Dashboard table listings, keyed by table name; writes through this app invalidate them
+_TABLE_CACHE: TTLCache = TTLCache(maxsize=64, ttl=30)
+# Rows hold contact details and change on every write - browsers must recheck, proxies must not store
+_TABLE_CACHE_HEADERS = {"Cache-Control": "private, no-cache"}
+
+
+def cached_table(table: str):
+    """Serve a list endpoint from _TABLE_CACHE for up to 30 seconds"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            rows = _TABLE_CACHE.get(table)
+            if rows is None:
+                rows = await fn(*args, **kwargs)
+                # Failed fetches come back empty - don't pin them in the cache
+                if rows:
+                    _TABLE_CACHE[table] = rows
+            return ORJSONResponse(content=rows, headers=_TABLE_CACHE_HEADERS)
+        return wrapper
+    return decorator
+
+
+def invalidate_table(table: str) -> None:
+    """Drop a cached table listing after a write"""
+    _TABLE_CACHE.pop(table, None)
+
 
 # Employee endpoints
 @app.get("/employees")
+@cached_table("employees")
 async def get_employees():
     """Get all employees"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         return []
     try:
@@ -206,12 +376,11 @@ async def get_employees():
 @app.get("/employees/{employee_id}")
 async def get_employee(employee_id: str):
     """Get a single employee"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         result = supabase.client.table("employees").select("*").eq("id", employee_id).single().execute()
-        return result.data
+        return ORJSONResponse(result.data)
     except Exception as e:
         logger.error(f"Failed to fetch employee: {e}")
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -219,13 +388,13 @@ async def get_employee(employee_id: str):
 @app.post("/employees")
 async def create_employee(request: Request):
     """Create a new employee"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         data = await request.json()
         result = supabase.client.table("employees").insert(data).execute()
-        return result.data[0] if result.data else None
+        invalidate_table("employees")
+        return ORJSONResponse(result.data[0] if result.data else None)
     except Exception as e:
         logger.error(f"Failed to create employee: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -233,13 +402,13 @@ async def create_employee(request: Request):
 @app.put("/employees/{employee_id}")
 async def update_employee(employee_id: str, request: Request):
     """Update an employee"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         data = await request.json()
         result = supabase.client.table("employees").update(data).eq("id", employee_id).execute()
-        return result.data[0] if result.data else None
+        invalidate_table("employees")
+        return ORJSONResponse(result.data[0] if result.data else None)
     except Exception as e:
         logger.error(f"Failed to update employee: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -247,7 +416,6 @@ async def update_employee(employee_id: str, request: Request):
 @app.post("/employees/import")
 async def import_employees(request: Request):
     """Bulk import employees from parsed data"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
@@ -256,9 +424,9 @@ async def import_employees(request: Request):
         if not employees:
             raise HTTPException(status_code=400, detail="No employees data provided")
 
-        imported = 0
         skipped = 0
         errors = []
+        batch = []
 
         for emp in employees:
             try:
@@ -285,13 +453,23 @@ async def import_employees(request: Request):
                     "notes": emp.get("notes", "").strip() or None
                 }
 
-                # Insert into database
-                supabase.client.table("employees").insert(employee_data).execute()
-                imported += 1
+                batch.append(employee_data)
             except Exception as e:
                 skipped += 1
                 errors.append(f"Error importing {emp.get('name', 'Unknown')}: {str(e)}")
 
+        # One insert for the whole batch; rows are retried individually if it fails
+        inserted = await supabase.insert("employees", batch)
+        invalidate_table("employees")
+        imported = len(inserted)
+
+        if imported < len(batch):
+            landed = {row.get("phone_number") for row in inserted}
+            for employee_data in batch:
+                if employee_data["phone_number"] not in landed:
+                    skipped += 1
+                    errors.append(f"Error importing {employee_data['name']}: insert failed")
+
         return {
             "success": True,
             "imported": imported,
@@ -308,9 +486,6 @@ async def import_employees(request: Request):
 @app.post("/seed/employees")
 async def seed_employees():
     """Create 20 sample employees with realistic interview data for demo purposes"""
-    from integrations.supabase_mcp import supabase
-    from datetime import datetime, timedelta
-    import uuid
 
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
@@ -425,6 +600,7 @@ AI Assistant: Those are excellent suggestions. This kind of specific feedback is
             }
 
             result = supabase.client.table("employees").insert(employee_data).execute()
+            invalidate_table("employees")
             if result.data:
                 created_employees.append(result.data[0])
 
@@ -462,9 +638,9 @@ AI Assistant: Those are excellent suggestions. This kind of specific feedback is
 
 # Consultations endpoints
 @app.get("/consultations")
+@cached_table("consultations")
 async def get_consultations():
     """Get all consultations"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         return []
     try:
@@ -477,12 +653,11 @@ async def get_consultations():
 @app.get("/consultations/{consultation_id}")
 async def get_consultation(consultation_id: str):
     """Get a single consultation"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         result = supabase.client.table("consultations").select("*").eq("id", consultation_id).single().execute()
-        return result.data
+        return ORJSONResponse(result.data)
     except Exception as e:
         logger.error(f"Failed to fetch consultation: {e}")
         raise HTTPException(status_code=404, detail="Consultation not found")
@@ -490,13 +665,13 @@ async def get_consultation(consultation_id: str):
 @app.post("/consultations")
 async def create_consultation(request: Request):
     """Create a new consultation"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         data = await request.json()
         result = supabase.client.table("consultations").insert(data).execute()
-        return result.data[0] if result.data else None
+        invalidate_table("consultations")
+        return ORJSONResponse(result.data[0] if result.data else None)
     except Exception as e:
         logger.error(f"Failed to create consultation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -504,22 +679,22 @@ async def create_consultation(request: Request):
 @app.put("/consultations/{consultation_id}")
 async def update_consultation(consultation_id: str, request: Request):
     """Update a consultation"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         data = await request.json()
         result = supabase.client.table("consultations").update(data).eq("id", consultation_id).execute()
-        return result.data[0] if result.data else None
+        invalidate_table("consultations")
+        return ORJSONResponse(result.data[0] if result.data else None)
     except Exception as e:
         logger.error(f"Failed to update consultation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Processes endpoints
 @app.get("/processes")
+@cached_table("processes")
 async def get_processes():
     """Get all processes"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         return []
     try:
@@ -532,12 +707,11 @@ async def get_processes():
 @app.get("/processes/{process_id}")
 async def get_process(process_id: str):
     """Get a single process"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         result = supabase.client.table("processes").select("*").eq("id", process_id).single().execute()
-        return result.data
+        return ORJSONResponse(result.data)
     except Exception as e:
         logger.error(f"Failed to fetch process: {e}")
         raise HTTPException(status_code=404, detail="Process not found")
@@ -545,13 +719,13 @@ async def get_process(process_id: str):
 @app.post("/processes")
 async def create_process(request: Request):
     """Create a new process"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         data = await request.json()
         result = supabase.client.table("processes").insert(data).execute()
-        return result.data[0] if result.data else None
+        invalidate_table("processes")
+        return ORJSONResponse(result.data[0] if result.data else None)
     except Exception as e:
         logger.error(f"Failed to create process: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -559,22 +733,22 @@ async def create_process(request: Request):
 @app.put("/processes/{process_id}")
 async def update_process(process_id: str, request: Request):
     """Update a process"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         data = await request.json()
         result = supabase.client.table("processes").update(data).eq("id", process_id).execute()
-        return result.data[0] if result.data else None
+        invalidate_table("processes")
+        return ORJSONResponse(result.data[0] if result.data else None)
     except Exception as e:
         logger.error(f"Failed to update process: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Reports endpoints
 @app.get("/reports")
+@cached_table("reports")
 async def get_reports():
     """Get all reports"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         return []
     try:
@@ -587,12 +761,11 @@ async def get_reports():
 @app.get("/reports/{report_id}")
 async def get_report(report_id: str):
     """Get a single report"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         result = supabase.client.table("reports").select("*").eq("id", report_id).single().execute()
-        return result.data
+        return ORJSONResponse(result.data)
     except Exception as e:
         logger.error(f"Failed to fetch report: {e}")
         raise HTTPException(status_code=404, detail="Report not found")
@@ -600,13 +773,13 @@ async def get_report(report_id: str):
 @app.post("/reports")
 async def create_report(request: Request):
     """Create a new report"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
         data = await request.json()
         result = supabase.client.table("reports").insert(data).execute()
-        return result.data[0] if result.data else None
+        invalidate_table("reports")
+        return ORJSONResponse(result.data[0] if result.data else None)
     except Exception as e:
         logger.error(f"Failed to create report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -615,10 +788,6 @@ async def create_report(request: Request):
 @app.post("/webhooks/cal")
 async def cal_webhook(request: Request):
     """Handle Cal.com booking webhooks - triggers Vapi call at scheduled time"""
-    import aiohttp
-    from datetime import datetime
-    from integrations.supabase_mcp import supabase
-
     try:
         data = await request.json()
         event_type = data.get("triggerEvent")
@@ -630,12 +799,15 @@ async def cal_webhook(request: Request):
             # Extract booking details
             attendees = payload.get("attendees", [])
             attendee = attendees[0] if attendees else {}
+            # Read once; both are reused for the immediate-call check below
+            client_phone = attendee.get("phone") or payload.get("responses", {}).get("phone", {}).get("value")
+            scheduled_at = payload.get("startTime")
 
             booking_data = {
                 "id": payload.get("uid"),
                 "client_email": attendee.get("email"),
-                "client_phone": attendee.get("phone") or payload.get("responses", {}).get("phone", {}).get("value"),
-                "scheduled_at": payload.get("startTime"),
+                "client_phone": client_phone,
+                "scheduled_at": scheduled_at,
                 "timezone": attendee.get("timeZone", "UTC"),
                 "status": "scheduled",
                 "source_platform": "cal.com",
@@ -649,20 +821,30 @@ async def cal_webhook(request: Request):
                 logger.info(f"Booking saved: {booking_data['id']}")
 
             # If booking is within next 5 minutes, trigger call immediately
-            if booking_data.get("scheduled_at"):
-                scheduled_time = datetime.fromisoformat(booking_data["scheduled_at"].replace("Z", "+00:00"))
+            if scheduled_at:
+                # Python 3.11+ parses a trailing "Z" directly
+                scheduled_time = datetime.fromisoformat(scheduled_at)
                 now = datetime.now(scheduled_time.tzinfo)
                 minutes_until = (scheduled_time - now).total_seconds() / 60
 
-                if minutes_until <= 5 and booking_data.get("client_phone"):
+                if minutes_until <= 5 and client_phone:
                     # Trigger Vapi call now
-                    await trigger_scheduled_call(booking_data["client_phone"], attendee.get("name", ""))
-                    logger.info(f"Immediate call triggered for {booking_data['client_phone']}")
+                    await call_booking(booking_data["id"], client_phone, attendee.get("name", ""))
+                    logger.info(f"Immediate call triggered for {client_phone}")
+                elif client_phone and booking_data["id"]:
+                    # Otherwise queue it for the booking's start time
+                    schedule_booking_call(booking_data["id"], scheduled_time, client_phone, attendee.get("name", ""))
+                    logger.info(f"Call scheduled for {scheduled_at}: {client_phone}")
 
             return {"status": "success", "booking_id": booking_data.get("id")}
 
         elif event_type == "BOOKING_CANCELLED":
             booking_uid = payload.get("uid")
+            if booking_uid:
+                try:
+                    scheduler.remove_job(booking_uid)
+                except JobLookupError:
+                    pass  # Already ran, or was never scheduled
             if supabase.client and booking_uid:
                 supabase.client.table("bookings").update(
                     {"status": "cancelled"}
@@ -677,9 +859,6 @@ async def cal_webhook(request: Request):
 
 async def trigger_scheduled_call(phone_number: str, name: str = ""):
     """Trigger a Vapi call for a scheduled booking with full employee context"""
-    import aiohttp
-    from integrations.supabase_mcp import supabase
-
     vapi_api_key = os.getenv("VAPI_API_KEY")
     vapi_phone_id = os.getenv("VAPI_PHONE_NUMBER_ID")
     vapi_assistant_id = os.getenv("VAPI_ASSISTANT_ID")
@@ -690,84 +869,82 @@ async def trigger_scheduled_call(phone_number: str, name: str = ""):
 
     # Look up employee by phone number to get full context
     employee = None
-    if supabase.client:
-        try:
-            result = supabase.client.table("employees").select("*").eq("phone_number", phone_number).execute()
-            if result.data:
-                employee = result.data[0]
-                logger.info(f"Found employee context for {phone_number}: {employee.get('name')}")
-        except Exception as e:
-            logger.warning(f"Could not fetch employee data: {e}")
+    # Off the event loop, so concurrently gathered triggers look up in parallel
+    matches = await supabase.query("employees", filters={"phone_number": phone_number}, limit=1)
+    if matches:
+        employee = matches[0]
+        logger.info(f"Found employee context for {phone_number}: {employee.get('name')}")
 
     try:
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                "Authorization": f"Bearer {vapi_api_key}",
-                "Content-Type": "application/json"
-            }
+        session = await get_session()
 
-            # Build variable values for Vapi template
-            variable_values = {
-                "full_name": employee.get("name", name) if employee else name,
-                "company_name": employee.get("company", "") if employee else "",
-                "department": employee.get("department", "") if employee else "",
-                "position": employee.get("role", "") if employee else "",
-                "employee_id": employee.get("id", "") if employee else "",
-                "kpis": employee.get("notes", "") if employee else "",
-                "email": employee.get("email", "") if employee else "",
-                "phone": phone_number
-            }
+        headers = {
+            "Authorization": f"Bearer {vapi_api_key}",
+            "Content-Type": "application/json"
+        }
 
-            payload = {
-                "phoneNumberId": vapi_phone_id,
-                "customer": {
-                    "number": phone_number,
-                    "name": variable_values["full_name"]
-                },
-                "assistantOverrides": {
-                    "variableValues": variable_values
-                }
+        # Build variable values for Vapi template
+        variable_values = {
+            "full_name": employee.get("name", name) if employee else name,
+            "company_name": employee.get("company", "") if employee else "",
+            "department": employee.get("department", "") if employee else "",
+            "position": employee.get("role", "") if employee else "",
+            "employee_id": employee.get("id", "") if employee else "",
+            "kpis": employee.get("notes", "") if employee else "",
+            "email": employee.get("email", "") if employee else "",
+            "phone": phone_number
+        }
+
+        payload = {
+            "phoneNumberId": vapi_phone_id,
+            "customer": {
+                "number": phone_number,
+                "name": variable_values["full_name"]
+            },
+            "assistantOverrides": {
+                "variableValues": variable_values
             }
+        }
 
-            if vapi_assistant_id:
-                payload["assistantId"] = vapi_assistant_id
-
-            logger.info(f"Triggering Vapi call with context: {variable_values}")
-
-            async with session.post(
-                "https://api.vapi.ai/call/phone",
-                headers=headers,
-                json=payload
-            ) as response:
-                if response.status == 201:
-                    result = await response.json()
-                    logger.info(f"Scheduled Vapi call triggered: {result.get('id')}")
-                    return True
-                else:
-                    error = await response.text()
-                    logger.error(f"Failed to trigger scheduled call: {error}")
-                    return False
+        if vapi_assistant_id:
+            payload["assistantId"] = vapi_assistant_id
+
+        logger.info(f"Triggering Vapi call with context: {variable_values}")
+
+        async with _VAPI_CALL_LIMIT, session.post(
+            "https://api.vapi.ai/call/phone",
+            headers=headers,
+            json=payload
+        ) as response:
+            if response.status == 201:
+                result = await response.json()
+                logger.info(f"Scheduled Vapi call triggered: {result.get('id')}")
+                return True
+            else:
+                error = await response.text()
+                logger.error(f"Failed to trigger scheduled call: {error}")
+                return False
 
     except Exception as e:
         logger.error(f"Error triggering scheduled call: {e}")
         return False
 
-# Debug endpoint to check SMS config
+# Debug endpoint to check SMS config - the environment is loaded once at startup, so serialize once too
+_SMS_CONFIG_BODY = orjson.dumps({
+    "TWILIO_ACCOUNT_SID": "set" if os.getenv("TWILIO_ACCOUNT_SID") else "MISSING",
+    "TWILIO_AUTH_TOKEN": "set" if os.getenv("TWILIO_AUTH_TOKEN") else "MISSING",
+    "TWILIO_PHONE_NUMBER": os.getenv("TWILIO_PHONE_NUMBER", "MISSING")
+})
+
 @app.get("/debug/sms-config")
 async def debug_sms_config():
     """Check SMS/Twilio configuration"""
-    return {
-        "TWILIO_ACCOUNT_SID": "set" if os.getenv("TWILIO_ACCOUNT_SID") else "MISSING",
-        "TWILIO_AUTH_TOKEN": "set" if os.getenv("TWILIO_AUTH_TOKEN") else "MISSING",
-        "TWILIO_PHONE_NUMBER": os.getenv("TWILIO_PHONE_NUMBER", "MISSING")
-    }
+    return Response(content=_SMS_CONFIG_BODY, media_type="application/json")
 
 # Debug endpoint to test call session creation
 @app.post("/debug/test-call-save")
 async def debug_test_call_save():
     """Test endpoint to verify call session saving works"""
-    from integrations.supabase_mcp import supabase
-    import uuid
 
     test_id = str(uuid.uuid4())
     test_data = {
@@ -800,18 +977,16 @@ async def debug_test_call_save():
 @app.get("/debug/bookings")
 async def debug_bookings():
     """Check pending bookings"""
-    from datetime import datetime
-    from integrations.supabase_mcp import supabase
 
     if not supabase.client:
         return {"error": "Database not available"}
 
     try:
         result = supabase.client.table("bookings").select("*").order("created_at", desc=True).limit(10).execute()
-        return {
+        return ORJSONResponse({
             "current_time_utc": datetime.utcnow().isoformat(),
             "bookings": result.data or []
-        }
+        })
     except Exception as e:
         return {"error": str(e)}
 
@@ -819,9 +994,6 @@ async def debug_bookings():
 @app.post("/test/trigger-call/{employee_id}")
 async def test_trigger_call(employee_id: str):
     """Test endpoint to trigger a Vapi call with full employee context"""
-    import aiohttp
-    from integrations.supabase_mcp import supabase
-
     vapi_api_key = os.getenv("VAPI_API_KEY")
     vapi_phone_id = os.getenv("VAPI_PHONE_NUMBER_ID")
     vapi_assistant_id = os.getenv("VAPI_ASSISTANT_ID")
@@ -868,42 +1040,43 @@ async def test_trigger_call(employee_id: str):
         }
 
         # Make direct Vapi call with detailed error handling
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                "Authorization": f"Bearer {vapi_api_key}",
-                "Content-Type": "application/json"
-            }
+        session = await get_session()
 
-            payload = {
-                "phoneNumberId": vapi_phone_id,
-                "customer": {
-                    "number": phone,
-                    "name": variable_values["full_name"]
-                },
-                "assistantOverrides": {
-                    "variableValues": variable_values
-                }
+        headers = {
+            "Authorization": f"Bearer {vapi_api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "phoneNumberId": vapi_phone_id,
+            "customer": {
+                "number": phone,
+                "name": variable_values["full_name"]
+            },
+            "assistantOverrides": {
+                "variableValues": variable_values
             }
+        }
 
-            if vapi_assistant_id:
-                payload["assistantId"] = vapi_assistant_id
-
-            async with session.post(
-                "https://api.vapi.ai/call/phone",
-                headers=headers,
-                json=payload
-            ) as response:
-                response_text = await response.text()
-
-                return {
-                    "success": response.status == 201,
-                    "vapi_status": response.status,
-                    "vapi_response": response_text,
-                    "employee": employee.get("name"),
-                    "phone": phone,
-                    "context_sent": variable_values,
-                    "env_status": env_status
-                }
+        if vapi_assistant_id:
+            payload["assistantId"] = vapi_assistant_id
+
+        async with session.post(
+            "https://api.vapi.ai/call/phone",
+            headers=headers,
+            json=payload
+        ) as response:
+            response_text = await response.text()
+
+            return {
+                "success": response.status == 201,
+                "vapi_status": response.status,
+                "vapi_response": response_text,
+                "employee": employee.get("name"),
+                "phone": phone,
+                "context_sent": variable_values,
+                "env_status": env_status
+            }
 
     except HTTPException:
         raise
@@ -919,33 +1092,12 @@ async def test_trigger_call(employee_id: str):
 @app.post("/webhooks/trigger-scheduled-calls")
 async def trigger_pending_calls():
     """Trigger calls for bookings that are due now (call via cron every minute)"""
-    from datetime import datetime, timedelta
-    from integrations.supabase_mcp import supabase
 
     if not supabase.client:
         return {"status": "error", "message": "Database not available"}
 
     try:
-        now = datetime.utcnow()
-        window_start = (now - timedelta(minutes=2)).isoformat()
-        window_end = (now + timedelta(minutes=2)).isoformat()
-
-        # Get pending bookings in the current time window
-        result = supabase.client.table("bookings").select("*").eq(
-            "status", "scheduled"
-        ).gte("scheduled_at", window_start).lte("scheduled_at", window_end).execute()
-
-        calls_triggered = 0
-        for booking in result.data or []:
-            phone = booking.get("client_phone")
-            if phone:
-                success = await trigger_scheduled_call(phone, booking.get("notes", ""))
-                if success:
-                    # Update booking status
-                    supabase.client.table("bookings").update(
-                        {"status": "call_triggered"}
-                    ).eq("id", booking["id"]).execute()
-                    calls_triggered += 1
+        calls_triggered = await trigger_due_bookings()
 
         return {"status": "success", "calls_triggered": calls_triggered}
 
@@ -1196,10 +1348,9 @@ Reply STOP to opt out. HELP for help.</code>
 @app.get("/insights")
 async def list_insights(limit: int = 50):
     """Get all AI-generated call insights"""
-    from integrations.supabase_mcp import supabase
     try:
         insights = await supabase.list_call_insights(limit=limit)
-        return {"insights": insights, "total": len(insights)}
+        return ORJSONResponse({"insights": insights, "total": len(insights)})
     except Exception as e:
         logger.error(f"Failed to list insights: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1207,12 +1358,11 @@ async def list_insights(limit: int = 50):
 @app.get("/insights/{call_session_id}")
 async def get_insights(call_session_id: str):
     """Get AI insights for a specific call session"""
-    from integrations.supabase_mcp import supabase
     try:
         insights = await supabase.get_call_insights(call_session_id)
         if not insights:
             raise HTTPException(status_code=404, detail="Insights not found")
-        return insights
+        return ORJSONResponse(insights)
     except HTTPException:
         raise
     except Exception as e:
@@ -1222,7 +1372,6 @@ async def get_insights(call_session_id: str):
 @app.post("/insights/analyze/{call_session_id}")
 async def analyze_call(call_session_id: str):
     """Manually trigger AI analysis for a call session"""
-    from integrations.supabase_mcp import supabase
     from core.analysis.transcript_analyzer import transcript_analyzer
 
     try:
@@ -1284,7 +1433,6 @@ async def analyze_call(call_session_id: str):
 @app.post("/insights/synthesize")
 async def synthesize_insights(request: Request):
     """Synthesize insights across multiple call sessions"""
-    from integrations.supabase_mcp import supabase
     from core.analysis.transcript_analyzer import transcript_analyzer
 
     try:
@@ -1355,7 +1503,6 @@ async def upload_document(
     department: str = Form(None)
 ):
     """Upload a document (PDF) for AI context"""
-    from integrations.supabase_mcp import supabase
     from core.documents.pdf_processor import pdf_processor
 
     try:
@@ -1417,14 +1564,13 @@ async def list_documents(
     limit: int = 50
 ):
     """List uploaded documents"""
-    from integrations.supabase_mcp import supabase
     try:
         documents = await supabase.get_documents(
             category=category,
             department=department,
             limit=limit
         )
-        return {"documents": documents, "total": len(documents)}
+        return ORJSONResponse({"documents": documents, "total": len(documents)})
     except Exception as e:
         logger.error(f"Failed to list documents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1435,7 +1581,6 @@ async def get_document_context(
     categories: str = None
 ):
     """Get combined document context for AI assistant"""
-    from integrations.supabase_mcp import supabase
     try:
         category_list = categories.split(",") if categories else None
         context = await supabase.get_document_context(
@@ -1453,7 +1598,6 @@ async def get_document_context(
 @app.delete("/documents/{document_id}")
 async def delete_document(document_id: str):
     """Delete a document"""
-    from integrations.supabase_mcp import supabase
     if not supabase.client:
         raise HTTPException(status_code=503, detail="Database not available")
     try:
@@ -1484,5 +1628,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     )
\ No newline at end of file
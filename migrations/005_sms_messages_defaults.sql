@@ -0,0 +1,6 @@
+-- Migration: Server-side defaults for sms_messages
+-- Lets the backend omit id/created_at when logging SMS
+-- Run this in your Supabase SQL editor
+
+ALTER TABLE public.sms_messages ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE public.sms_messages ALTER COLUMN created_at SET DEFAULT NOW();
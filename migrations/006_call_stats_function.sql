@@ -0,0 +1,27 @@
+-- Migration: Aggregate call statistics in Postgres
+-- Backs GET /voice/calls/stats with a single-row result instead of
+-- shipping every call session to the API for counting
+-- Run this in your Supabase SQL editor
+
+CREATE OR REPLACE FUNCTION public.call_stats(p_days INT DEFAULT 30)
+RETURNS TABLE (
+    total BIGINT,
+    completed BIGINT,
+    active BIGINT,
+    avg_duration NUMERIC,
+    inbound BIGINT,
+    outbound BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        count(*) AS total,
+        count(*) FILTER (WHERE status = 'completed') AS completed,
+        count(*) FILTER (WHERE status IN ('connecting', 'in-progress', 'initiated')) AS active,
+        coalesce(avg(duration_seconds) FILTER (WHERE status = 'completed' AND duration_seconds > 0), 0) AS avg_duration,
+        count(*) FILTER (WHERE direction = 'inbound') AS inbound,
+        count(*) FILTER (WHERE direction = 'outbound') AS outbound
+    FROM public.call_sessions
+    WHERE created_at >= now() - make_interval(days => p_days);
+$$;
@@ -0,0 +1,37 @@
+-- Migration: Complete a call session and record its analytics event atomically
+-- Backs the Vapi end-of-call report with one round-trip instead of an
+-- UPDATE on call_sessions followed by a separate INSERT into analytics
+-- Run this in your Supabase SQL editor
+
+CREATE OR REPLACE FUNCTION public.complete_call(
+    p_session_id UUID,
+    p_duration INT,
+    p_transcript TEXT,
+    p_summary TEXT
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE public.call_sessions
+    SET status = 'completed',
+        ended_at = now(),
+        duration_seconds = p_duration,
+        transcript = p_transcript,
+        summary = p_summary,
+        updated_at = now()
+    WHERE id = p_session_id;
+
+    INSERT INTO public.analytics (event_type, platform, session_id, data)
+    VALUES (
+        'call_completed',
+        'vapi',
+        p_session_id,
+        jsonb_build_object(
+            'session_id', p_session_id,
+            'platform', 'vapi',
+            'duration_seconds', p_duration
+        )
+    );
+END;
+$$;
@@ -0,0 +1,12 @@
+-- Migration: Allow the call statuses the booking scheduler writes
+-- 'calling' marks a booking claimed by the date job or fallback sweep while
+-- its Vapi call is placed; 'call_triggered' marks a call that went out
+-- Run this in your Supabase SQL editor
+
+ALTER TABLE public.bookings DROP CONSTRAINT IF EXISTS bookings_status_check;
+
+ALTER TABLE public.bookings ADD CONSTRAINT bookings_status_check
+    CHECK (status IN (
+        'scheduled', 'calling', 'call_triggered',
+        'confirmed', 'completed', 'cancelled', 'no_show'
+    ));
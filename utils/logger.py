@@ -5,8 +5,10 @@ Provides consistent logging across all modules
 
 import os
 import sys
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 import json
 from typing import Optional
@@ -70,62 +72,64 @@ class JSONFormatter(logging.Formatter):
 
         return json.dumps(log_obj)
 
-def setup_logger(name: str, log_level: str = None) -> logging.Logger:
-    """
-    Set up a logger with consistent configuration
+_PLAIN_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-    Args:
-        name: Logger name (usually module name)
-        log_level: Override log level for this logger
 
-    Returns:
-        Configured logger instance
-    """
-    logger = logging.getLogger(name)
+def _rotating_handler(filename: str, formatter: logging.Formatter) -> RotatingFileHandler:
+    """Size-rotated file handler in LOG_DIR"""
+    handler = RotatingFileHandler(
+        os.path.join(LOG_DIR, filename),
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=5
+    )
+    handler.setFormatter(formatter)
+    return handler
 
-    # Don't add handlers if they already exist
-    if logger.handlers:
-        return logger
 
-    # Set log level
-    level = getattr(logging, log_level or LOG_LEVEL.upper())
-    logger.setLevel(level)
+class _LocalQueueHandler(QueueHandler):
+    """QueueHandler for a listener in the same process"""
 
-    # Console handler with custom formatter
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
+    def prepare(self, record):
+        # Freeze the message while its args still hold their call-time values, but keep
+        # exc_info - the stock prepare() drops it, and the JSON formatter needs it
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
-    # Use colored output for development, plain for production
-    if os.getenv("ENV", "development") == "development":
-        console_handler.setFormatter(CustomFormatter())
-    else:
-        console_handler.setFormatter(
-            logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        )
 
-    logger.addHandler(console_handler)
+class _PerLoggerFileHandler(logging.Handler):
+    """Writes each logger's records to its own <name>.log and <name>.json files"""
 
-    # File handler with rotation
-    file_handler = RotatingFileHandler(
-        os.path.join(LOG_DIR, f"{name}.log"),
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setLevel(level)
-    file_handler.setFormatter(
-        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    )
-    logger.addHandler(file_handler)
+    def __init__(self):
+        super().__init__()
+        self._files = {}
 
-    # JSON file handler for structured logs
-    json_handler = RotatingFileHandler(
-        os.path.join(LOG_DIR, f"{name}.json"),
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    json_handler.setLevel(level)
-    json_handler.setFormatter(JSONFormatter())
-    logger.addHandler(json_handler)
+    def emit(self, record):
+        # Only the listener thread calls this, so each file has exactly one writer
+        pair = self._files.get(record.name)
+        if pair is None:
+            pair = self._files[record.name] = (
+                _rotating_handler(f"{record.name}.log", logging.Formatter(_PLAIN_FORMAT)),
+                _rotating_handler(f"{record.name}.json", JSONFormatter())
+            )
+        for handler in pair:
+            handler.handle(record)
+
+    def close(self):
+        for pair in self._files.values():
+            for handler in pair:
+                handler.close()
+        super().close()
+
+
+def _build_handlers() -> list:
+    """Console, per-logger file and shared error handlers fed by the log queue"""
+    # Console handler - colored output for development, plain for production
+    console_handler = logging.StreamHandler(sys.stdout)
+    if os.getenv("ENV", "development") == "development":
+        console_handler.setFormatter(CustomFormatter())
+    else:
+        console_handler.setFormatter(logging.Formatter(_PLAIN_FORMAT))
 
     # Error file handler (only errors and above)
     error_handler = TimedRotatingFileHandler(
@@ -136,11 +140,41 @@ def setup_logger(name: str, log_level: str = None) -> logging.Logger:
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(
-        logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s\n%(pathname)s:%(lineno)d'
-        )
+        logging.Formatter(_PLAIN_FORMAT + '\n%(pathname)s:%(lineno)d')
     )
-    logger.addHandler(error_handler)
+
+    return [console_handler, _PerLoggerFileHandler(), error_handler]
+
+
+# Loggers only enqueue records; one listener thread does all console/file I/O,
+# so logging from async handlers never blocks the event loop
+_LOG_QUEUE = queue.SimpleQueue()
+_QUEUE_HANDLER = _LocalQueueHandler(_LOG_QUEUE)
+_LISTENER = QueueListener(_LOG_QUEUE, *_build_handlers(), respect_handler_level=True)
+_LISTENER.start()
+atexit.register(_LISTENER.stop)
+
+
+def setup_logger(name: str, log_level: str = None) -> logging.Logger:
+    """
+    Set up a logger with consistent configuration
+
+    Args:
+        name: Logger name (usually module name)
+        log_level: Override log level for this logger
+
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+
+    # Don't add handlers if they already exist
+    if logger.handlers:
+        return logger
+
+    # Level is enforced on the logger, before anything is enqueued
+    logger.setLevel(getattr(logging, log_level or LOG_LEVEL.upper()))
+    logger.addHandler(_QUEUE_HANDLER)
 
     return logger
 
@@ -0,0 +1,12 @@
+"""
+Time helpers for Otom
+Fast UTC timestamp formatting for database records
+"""
+
+import time
+
+
+def utcnow_iso() -> str:
+    """Current UTC time as an ISO-8601 string with microseconds, e.g. 2024-01-01T12:00:00.000000Z"""
+    s, ns = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(s)) + f".{ns // 1000:06d}Z"